@@ -1,72 +1,241 @@
 import csv
-from extract_text import extract_from_pdf, extract_from_docx
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from itertools import islice
+
+import numpy as np
+
+from extract_text import ParsedDocument, parse_document, parse_bytes
+from role_packs import role_packs
+from semantic import semantic_report
+from skill_matcher import get_matcher
+from skill_taxonomy import get_skill_trie
 
 # ----------------------------
-# Predefined Keyword Lists
+# JD keyword extraction
 # ----------------------------
-def extract_keywords(jd_text):
-    technical_skills = [
-        # Programming Languages
-        "java", "python", "c", "c++", "javascript", "typescript",
-        # Web Technologies
-        "html", "css", "react", "angular", "node.js", "spring boot", "flask",
-        # Databases
-        "mysql", "mongodb", "postgresql", "sqlite",
-        # CS Core Subjects
-        "data structures", "algorithms", "dbms", "os", "computer networks",
-        # Tools
-        "git", "github", "docker", "kubernetes", "jira", "postman", "api testing"
-    ]
-    soft_skills = [
-        "communication", "teamwork", "leadership", "problem solving",
-        "time management", "adaptability", "critical thinking",
-        "collaboration", "creativity", "attention to detail"
-    ]
-    return {"technical": technical_skills, "soft": soft_skills}
+@lru_cache(maxsize=128)
+def _detect_role(jd_text):
+    return role_packs.detect(jd_text)
+
+
+def extract_keywords(jd_text, role=None):
+    """Technical and soft skills the JD asks for, most important first.
+
+    Skills come from the vocabulary in data/skill_vocabulary.json and are
+    weighted by TF-IDF (how often the JD mentions them x how distinctive they
+    are); the weights are on the returned KeywordSet. Aliases from
+    data/skill_taxonomy.json are reported under their canonical name ("k8s"
+    -> "kubernetes"). A category the JD never mentions falls back to the
+    vocabulary's default skills for it.
+
+    `role` picks a role pack from data/roles (or "general" for the whole
+    vocabulary); by default it is detected from the JD text. The role used
+    is on the returned KeywordSet.
+    """
+    jd_text = ParsedDocument(jd_text or "").normalized
+    # The pack memoizes its JDs; a reloaded taxonomy yields a new pack and re-extracts them
+    return role_packs.get(role or _detect_role(jd_text)).jd_keywords(jd_text)
 
 
 # ----------------------------
 # Load job description text
 # ----------------------------
-def load_job_description(file_path):
-    with open(file_path, "r", encoding="utf-8") as f:
+def load_job_description(source):
+    """Read a JD from a path or an uploaded file/stream and lowercase it."""
+    if hasattr(source, "read"):
+        data = source.read()
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", errors="replace")
+        return data.lower()
+    with open(source, "r", encoding="utf-8") as f:
         return f.read().lower()
 
 
 # ----------------------------
 # Analyze resume vs job description
 # ----------------------------
-def analyze_resume(file_path, jd_text=None):
-    resume_text = ""
+def analyze_resume(resume, jd_text=None, keywords=None, role=None):
+    """Analyze resume text (a str or an already-parsed ParsedDocument) against a JD.
 
-    if file_path.endswith(".pdf"):
-        resume_text = extract_from_pdf(file_path)
-    elif file_path.endswith(".docx"):
-        resume_text = extract_from_docx(file_path)
-    else:
-        raise ValueError("Unsupported file format. Use .pdf or .docx")
+    Pass `keywords` (from extract_keywords) to skip re-deriving them when the
+    same JD is scored against many resumes; `role` is passed on to
+    extract_keywords otherwise. match_percent is weighted by each
+    skill's TF-IDF weight in the JD; a plain list of keywords counts equally.
+    """
+    if not isinstance(resume, ParsedDocument):
+        resume = ParsedDocument(resume)
 
-    resume_text = resume_text.lower()
-    if jd_text is None:
-        jd_text = resume_text
+    resume_text = resume.normalized
 
-    keywords = extract_keywords(jd_text)
+    if keywords is None:
+        keywords = extract_keywords(jd_text, role)
     results = {}
 
+    # One trie scan (the role pack's, when the JD was read with one) finds every
+    # known skill under its canonical name; only keywords outside the taxonomy
+    # (custom lists) fall back to a regex matcher
+    trie = getattr(keywords, "trie", None) or get_skill_trie()
+    found = trie.find(resume_text)
+    unknown = [word for words in keywords.values() for word in words if word not in trie.canonical]
+    if unknown:
+        found.update(get_matcher(unknown).find(resume_text))
+
     for category, words in keywords.items():
-        matched = [kw for kw in words if kw in resume_text]
-        missing = [kw for kw in words if kw not in resume_text]
-        match_percent = (len(matched) / len(words)) * 100 if words else 0
+        hit = np.fromiter((word in found for word in words), dtype=bool, count=len(words))
+        matched = [word for word, ok in zip(words, hit) if ok]
+        missing = [word for word, ok in zip(words, hit) if not ok]
+
+        # Each skill counts by its weight in the JD, not one-for-one
+        weights = keywords.vectors[category] if hasattr(keywords, "vectors") else np.ones(len(words), dtype=np.float32)
+        total = float(weights.sum())
+        match_percent = float(weights[hit].sum()) / total * 100 if total else 0
 
         results[category] = {
             "matched": matched,
             "missing": missing,
-            "match_percent": round(match_percent, 2)
+            "match_percent": round(match_percent, 2),
+            "matched_weight": round(float(weights[hit].sum()), 4),
+            "total_weight": round(total, 4),
         }
 
     return results
 
 
+def analyze_semantic(resume, jd_text, keywords=None, role=None):
+    """analyze_resume() results plus the semantic report for the same JD keywords.
+
+    The report (see semantic.semantic_report) adds skills the resume only
+    paraphrases ("led a team of 5" for leadership) and an evidence sentence
+    for every matched skill.
+    """
+    if not isinstance(resume, ParsedDocument):
+        resume = ParsedDocument(resume)
+    if keywords is None:
+        keywords = extract_keywords(jd_text, role)
+    results = analyze_resume(resume, keywords=keywords)
+    return results, semantic_report(resume.text, jd_text or "", keywords, results)
+
+
+# ----------------------------
+# Batch analysis: many resumes vs one JD
+# ----------------------------
+def overall_match(results):
+    """Weighted share of all JD keywords (every category) found in the resume, as a percentage."""
+    total = sum(r["total_weight"] for r in results.values())
+    matched = sum(r["matched_weight"] for r in results.values())
+    return round(matched / total * 100, 2) if total else 0
+
+
+# Processes that extract uploaded resumes, shared by every batch in this worker
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+EXTRACT_CHUNK = int(os.getenv("EXTRACT_CHUNK", "32"))  # uploads read and extracted at a time
+_extract_pool = None
+_extract_pool_lock = threading.Lock()
+
+
+def get_extract_pool():
+    """The shared extraction pool, started on first use.
+
+    Children come from a forkserver (spawn where there is none) rather than
+    fork(), which would copy this process's threads and held locks.
+    """
+    global _extract_pool
+    if _extract_pool is None:
+        with _extract_pool_lock:
+            if _extract_pool is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                if context.get_start_method() == "forkserver":
+                    context.set_forkserver_preload(["extract_text"])
+                _extract_pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS, mp_context=context)
+    return _extract_pool
+
+
+def _reset_extract_pool(pool):
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is pool:
+            _extract_pool = None
+    pool.shutdown(wait=False)
+
+
+def _extract_for_batch(item):
+    filename, data = item
+    try:
+        return parse_bytes(data, filename).text, None
+    except Exception as e:
+        return None, str(e)
+
+
+def _extract_chunk(raw, workers):
+    """(text, error) for each (filename, bytes) pair, on the shared pool when `workers` > 1."""
+    if workers > 1:
+        pool = get_extract_pool()
+        try:
+            return list(pool.map(_extract_for_batch, raw, chunksize=4))
+        except BrokenProcessPool:
+            # A child died (OOM, killed); start a new pool next time and finish this chunk here
+            _reset_extract_pool(pool)
+    return [_extract_for_batch(doc) for doc in raw]
+
+
+def score_many(docs, jd_text, workers=None, role=None, semantic=False):
+    """Score many resumes against one JD, yielding each entry (unranked) as soon as it is scored.
+
+    `docs` is an iterable of ParsedDocuments/str (already extracted) or
+    (filename, bytes) pairs, which are extracted in parallel on the shared
+    process pool (`workers=1` extracts them in this process instead),
+    EXTRACT_CHUNK at a time so scored entries come out while later ones are
+    still being extracted. The JD's keyword
+    lists and matchers are built once for the whole batch. Documents that
+    fail to extract yield an entry with an "error" instead of scores. With
+    `semantic`, each entry also carries a "semantic" report.
+    """
+    keywords = extract_keywords(jd_text, role)
+    docs = iter(docs)
+    while chunk := list(islice(docs, EXTRACT_CHUNK)):
+        raw = [doc for doc in chunk if isinstance(doc, tuple)]
+        outputs = iter(_extract_chunk(raw, workers or min(len(raw), EXTRACT_WORKERS)) if raw else ())
+        for doc in chunk:
+            if isinstance(doc, tuple):
+                filename = doc[0]
+                text, error = next(outputs)
+                if error is not None:
+                    yield {"filename": filename, "error": error}
+                    continue
+                doc = ParsedDocument(text, filename=filename)
+            elif not isinstance(doc, ParsedDocument):
+                doc = ParsedDocument(doc)
+
+            entry = {"filename": doc.filename, "role": keywords.role}
+            if semantic:
+                results, entry["semantic"] = analyze_semantic(doc, jd_text, keywords=keywords)
+            else:
+                results = analyze_resume(doc, jd_text, keywords=keywords)
+            yield {**entry, "overall_match": overall_match(results), **results}
+
+
+def rank_entries(entries):
+    """score_many() entries best first, each with its "rank"; failed documents go last, unranked."""
+    ranked, failed = [], []
+    for entry in entries:
+        (failed if "error" in entry else ranked).append(entry)
+    ranked.sort(key=lambda r: r["overall_match"], reverse=True)
+    for rank, entry in enumerate(ranked, 1):
+        entry["rank"] = rank
+    return ranked + failed
+
+
+def analyze_many(docs, jd_text, workers=None, role=None, semantic=False):
+    """Score many resumes against one JD and return them ranked best first (see score_many)."""
+    return rank_entries(score_many(docs, jd_text, workers=workers, role=role, semantic=semantic))
+
+
 # ----------------------------
 # Generate smart resume suggestions
 # ----------------------------
@@ -127,7 +296,7 @@ if __name__ == "__main__":
     jd_path = "job_description.txt"
 
     jd_text = load_job_description(jd_path)
-    results = analyze_resume(resume_path, jd_text)
+    results = analyze_resume(parse_document(resume_path), jd_text)
 
     print("\n📊 Resume Analysis Report:")
     for category, data in results.items():
@@ -1,6 +1,6 @@
 import json
+import re
 from io import BytesIO
-import pdfkit
 from flask import render_template, request, send_file
 
 import os
@@ -8,33 +8,44 @@ os.environ["FLASK_RUN_FROM_CLI"] = "false"
 os.environ["WATCHDOG_IGNORE_DIRECTORIES"] = "venv"
 
 from dotenv import load_dotenv
-import google.generativeai as genai
-from flask import Flask, render_template, request, redirect, url_for, flash, session, send_file
+from flask import Flask, Request, Response, render_template, request, redirect, url_for, flash, session, send_file, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy import and_, case, false, func, inspect, or_
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.schema import CreateColumn
+from tempfile import SpooledTemporaryFile
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.security import generate_password_hash, check_password_hash
 import importlib
+import click
 
 # ----------------------------
 # Load environment variables
 # ----------------------------
 load_dotenv()
 
-# ✅ Initialize Gemini API
-api_key = os.getenv("GEMINI_API_KEY")
-if api_key:
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel("models/gemini-2.5-flash-preview-09-2025")
+# ✅ Initialize the shared Gemini client (one configured model for every route)
+from llm_client import get_client, LLMError
+
+llm = get_client()
+if llm:
     print("✅ Gemini client initialized successfully.")
 else:
     print("⚠️  GEMINI_API_KEY not found. AI features will be disabled, but resume builder will work.")
-    model = None
 
 # ----------------------------
 # Import helpers
 # ----------------------------
-from analyzer import analyze_resume, load_job_description, save_to_csv
-from extract_text import extract_from_pdf, extract_from_docx
+from analyzer import analyze_resume, score_many, rank_entries, analyze_semantic, extract_keywords, load_job_description, save_to_csv
+from role_packs import role_packs, UnknownRole
+from extract_text import parse_upload, parse_bytes, UPLOAD_SPOOL_LIMIT
+from jd_library import JDLibraryCache, JD_MATCH_LIMIT, keyword_skills
+from jobs import JobQueue, job_to_dict
+from db_config import database_uri, engine_options, install_sqlite_pragmas
+from assets import Assets, build_assets
+import http_cache
+from http_cache import cache_anonymous_page
 import pdf_report
 print("📄 Using pdf_report from:", pdf_report.__file__)
 importlib.reload(pdf_report)
@@ -44,9 +55,23 @@ print("📄 Using latest pdf_report from:", pdf_report.__file__)
 # ----------------------------
 # Flask Config
 # ----------------------------
+# Largest request body accepted (all files of a batch together); bigger ones get a 413
+MAX_UPLOAD_MB = int(os.getenv("MAX_UPLOAD_MB", "100"))
+
+
+class SpooledRequest(Request):
+    """Keep uploads in memory up to UPLOAD_SPOOL_LIMIT, then spill to a private temp file."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return SpooledTemporaryFile(max_size=UPLOAD_SPOOL_LIMIT, mode="rb+")
+
+
 app = Flask(__name__)
+app.request_class = SpooledRequest
 app.secret_key = 'your_super_secret_key_here'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///site.db'
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_MB * 1024 * 1024
+app.config['SQLALCHEMY_DATABASE_URI'] = database_uri()
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
 db = SQLAlchemy(app)
 
 UPLOAD_FOLDER = 'uploads'
@@ -62,6 +87,25 @@ class User(db.Model):
     reports = db.relationship('AnalysisReport', backref='user', lazy=True)
 
 
+class Job(db.Model):
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    result_json = db.Column(db.Text, nullable=True)
+    result_file = db.Column(db.LargeBinary, nullable=True)
+    result_filename = db.Column(db.String(255), nullable=True)
+    result_mimetype = db.Column(db.String(100), nullable=True)
+    worker_id = db.Column(db.String(120), nullable=True)  # process that owns the job
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (db.Index('ix_job_user_created', 'user_id', 'created_at'),)
+
+
 class AnalysisReport(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -74,11 +118,114 @@ class AnalysisReport(db.Model):
     soft_matched_skills = db.Column(db.Text, nullable=True)
     soft_missing_skills = db.Column(db.Text, nullable=True)
 
+    skills = db.relationship('ReportSkill', backref='report', lazy=True, cascade='all, delete-orphan')
+
+    # Dashboard reads are "this user's reports, newest first"; cohort aggregates filter on date alone
+    __table_args__ = (
+        db.Index('ix_analysis_report_user_date', 'user_id', 'date_created'),
+        db.Index('ix_analysis_report_date', 'date_created'),
+    )
+
+
+class Skill(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+
+
+class ReportSkill(db.Model):
+    """One skill of one report: which category it was scored in and whether it matched."""
+    report_id = db.Column(db.Integer, db.ForeignKey('analysis_report.id'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), primary_key=True)
+    category = db.Column(db.String(20), nullable=False)
+    matched = db.Column(db.Boolean, nullable=False)
+
+    skill = db.relationship('Skill')
+
+    __table_args__ = (db.Index('ix_report_skill_skill_matched', 'skill_id', 'matched'),)
+
+
+class PreviewState(db.Model):
+    """Last payload a live-preview editor rendered (see live_preview.PreviewSessions)."""
+    id = db.Column(db.String(32), primary_key=True)
+    template = db.Column(db.String(80), nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON
+    version = db.Column(db.Integer, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, index=True)
+
+
+class JobDescription(db.Model):
+    """A JD in the library, stored with the weighted skills extracted from it."""
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=True)
+    company = db.Column(db.String(200), nullable=True)
+    text = db.Column(db.Text, nullable=False)
+    role = db.Column(db.String(40), nullable=False)
+    # Set when the role was given on import; otherwise reindex-jds detects it again
+    role_explicit = db.Column(db.Boolean, nullable=False, default=False, server_default=false())
+    skills_json = db.Column(db.Text, nullable=False)  # {category: {skill: TF-IDF weight}}
+    skills_digest = db.Column(db.String(32), nullable=False)  # taxonomy the skills were extracted with
+    added_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+def ensure_indexes():
+    """create_all() skips existing tables, so add any indexes declared since they were created."""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+
+def ensure_columns():
+    """create_all() doesn't alter existing tables either, so add columns declared since (nullable or with a server default)."""
+    inspector = inspect(db.engine)
+    preparer = db.engine.dialect.identifier_preparer
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                ddl = CreateColumn(column).compile(dialect=db.engine.dialect)
+                with db.engine.begin() as conn:
+                    conn.exec_driver_sql(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}")
+
+
+with app.app_context():
+    install_sqlite_pragmas(db.engine)
+    try:
+        db.create_all()
+        ensure_columns()
+        ensure_indexes()
+    except OperationalError:
+        # Another gunicorn worker created the same table/column/index a moment earlier
+        db.create_all()
+        ensure_columns()
+        ensure_indexes()
+
+job_queue = JobQueue()
+job_queue.init_app(app, db, Job)
+
+# gzip/brotli + ETag/304 on every eligible response
+http_cache.init_app(app)
+
+# Fingerprinted images/JS/CSS from `flask build-assets`, served from /assets/ with immutable caching
+assets = Assets()
+assets.init_app(app)
+
+
+@app.cli.command('build-assets')
+def build_assets_command():
+    """Convert images to AVIF/WebP (+ PNG fallback), fingerprint JS/CSS and precompress them."""
+    manifest = build_assets()
+    print(f"✅ Built {len(manifest)} asset(s) into {assets.asset_dir}")
+
 
 # ----------------------------
 # Routes
 # ----------------------------
 @app.route('/')
+@cache_anonymous_page()
 def home():
     if 'username' in session:
         return render_template('index.html', logged_in=True, username=session['username'])
@@ -167,28 +314,197 @@ def dashboard():
         return redirect(url_for('login'))
 
     user = User.query.filter_by(username=session['username']).first()
-    reports = AnalysisReport.query.filter_by(user_id=user.id).order_by(AnalysisReport.date_created.desc()).all()
-    return render_template('dashboard.html', username=session['username'], reports=reports)
+    reports, next_cursor = report_page(user.id, request.args.get('before'))
+    summary = report_summary(user.id)
+    top_missing = top_skills(False, user_id=user.id, limit=8)
+    jobs = Job.query.filter_by(user_id=user.id).order_by(Job.created_at.desc()).limit(20).all()
+    return render_template(
+        'dashboard.html',
+        username=session['username'],
+        reports=reports,
+        next_cursor=next_cursor,
+        summary=summary,
+        top_missing=top_missing,
+        jobs=jobs,
+    )
+
+
+# ----------------------------
+# Analysis history helpers
+# ----------------------------
+REPORTS_PER_PAGE = 20
+TREND_WINDOW_DAYS = 30
+
+
+def save_analysis_report(user_id, results, job_title=None):
+    """Persist one analysis so it shows up in the dashboard history."""
+    report = AnalysisReport(
+        user_id=user_id,
+        job_title=job_title[:200] if job_title else None,
+        technical_match=results["technical"]["match_percent"],
+        technical_matched_skills=", ".join(results["technical"]["matched"]),
+        technical_missing_skills=", ".join(results["technical"]["missing"]),
+        soft_match=results["soft"]["match_percent"],
+        soft_matched_skills=", ".join(results["soft"]["matched"]),
+        soft_missing_skills=", ".join(results["soft"]["missing"]),
+    )
+    for category in ("technical", "soft"):
+        add_report_skills(report, category, results[category]["matched"], results[category]["missing"])
+    db.session.add(report)
+    db.session.commit()
+    return report
+
+
+def get_or_create_skills(names):
+    """Map skill names to Skill rows, inserting the ones not seen before."""
+    names = {name.strip().lower() for name in names if name and name.strip()}
+    if not names:
+        return {}
+    skills = {s.name: s for s in Skill.query.filter(Skill.name.in_(names)).all()}
+    for name in names - skills.keys():
+        try:
+            with db.session.begin_nested():
+                skill = Skill(name=name)
+                db.session.add(skill)
+        except IntegrityError:
+            # Another worker inserted it first
+            skill = Skill.query.filter_by(name=name).one()
+        skills[name] = skill
+    return skills
+
+
+def add_report_skills(report, category, matched, missing):
+    skills = get_or_create_skills(list(matched) + list(missing))
+    seen = {rs.skill_id for rs in report.skills if rs.skill_id is not None}
+    for names, is_match in ((matched, True), (missing, False)):
+        for name in names:
+            skill = skills.get(name.strip().lower())
+            if skill is None or skill.id in seen:
+                continue
+            seen.add(skill.id)
+            report.skills.append(ReportSkill(skill=skill, skill_id=skill.id, category=category, matched=is_match))
+
+
+def split_skills(text):
+    return [part.strip() for part in (text or "").split(",") if part.strip()]
+
+
+def backfill_report_skills(batch_size=500):
+    """Populate report_skill from the legacy comma-joined columns for reports that have no rows yet."""
+    migrated = 0
+    last_id = 0
+    while True:
+        reports = (
+            AnalysisReport.query
+            .filter(AnalysisReport.id > last_id, ~AnalysisReport.skills.any())
+            .order_by(AnalysisReport.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not reports:
+            return migrated
+        for report in reports:
+            add_report_skills(report, "technical", split_skills(report.technical_matched_skills),
+                              split_skills(report.technical_missing_skills))
+            add_report_skills(report, "soft", split_skills(report.soft_matched_skills),
+                              split_skills(report.soft_missing_skills))
+            migrated += bool(report.skills)
+        db.session.commit()
+        last_id = reports[-1].id
+
+
+@app.cli.command('backfill-skills')
+def backfill_skills_command():
+    """Move skills stored in the old comma-joined columns into the skill tables."""
+    print(f"✅ Backfilled skills for {backfill_report_skills()} report(s).")
+
+
+def top_skills(matched, user_id=None, days=90, limit=10, category=None):
+    """Most frequent matched/missing skills over the last `days`, as an indexed GROUP BY."""
+    since = datetime.utcnow() - timedelta(days=days)
+    occurrences = func.count(ReportSkill.report_id).label('occurrences')
+    query = (
+        db.session.query(Skill.name, occurrences)
+        .join(ReportSkill, ReportSkill.skill_id == Skill.id)
+        .join(AnalysisReport, AnalysisReport.id == ReportSkill.report_id)
+        .filter(ReportSkill.matched == matched, AnalysisReport.date_created >= since)
+    )
+    if user_id is not None:
+        query = query.filter(AnalysisReport.user_id == user_id)
+    if category:
+        query = query.filter(ReportSkill.category == category)
+    rows = query.group_by(Skill.name).order_by(occurrences.desc(), Skill.name).limit(limit).all()
+    return [{"skill": name, "count": count} for name, count in rows]
+
+
+def job_title_from_filename(filename):
+    return os.path.splitext(os.path.basename(filename or ""))[0].replace("_", " ").strip() or None
+
+
+def report_page(user_id, cursor=None, per_page=REPORTS_PER_PAGE):
+    """Keyset-paginated reports, newest first. `cursor` is the "<timestamp>|<id>" of the last row seen.
+
+    Walks the (user_id, date_created) index instead of OFFSET-scanning, so deep
+    pages cost the same as the first one.
+    """
+    query = AnalysisReport.query.filter(AnalysisReport.user_id == user_id)
+    if cursor:
+        try:
+            stamp, last_id = cursor.split("|")
+            stamp, last_id = datetime.fromisoformat(stamp), int(last_id)
+        except ValueError:
+            stamp = None
+        if stamp is not None:
+            query = query.filter(or_(
+                AnalysisReport.date_created < stamp,
+                and_(AnalysisReport.date_created == stamp, AnalysisReport.id < last_id),
+            ))
+
+    rows = query.order_by(AnalysisReport.date_created.desc(), AnalysisReport.id.desc()).limit(per_page + 1).all()
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = f"{last.date_created.isoformat()}|{last.id}"
+    return rows, next_cursor
+
+
+def report_summary(user_id, window_days=TREND_WINDOW_DAYS):
+    """Count, average match and trend for a user's history, aggregated in SQL in one query."""
+    now = datetime.utcnow()
+    recent_start = now - timedelta(days=window_days)
+    previous_start = now - timedelta(days=2 * window_days)
+    in_recent = AnalysisReport.date_created >= recent_start
+    in_previous = and_(AnalysisReport.date_created >= previous_start, AnalysisReport.date_created < recent_start)
+
+    count, avg_technical, avg_soft, recent, previous = db.session.query(
+        func.count(AnalysisReport.id),
+        func.avg(AnalysisReport.technical_match),
+        func.avg(AnalysisReport.soft_match),
+        func.avg(case((in_recent, AnalysisReport.technical_match))),
+        func.avg(case((in_previous, AnalysisReport.technical_match))),
+    ).filter(AnalysisReport.user_id == user_id).one()
+
+    return {
+        "count": count,
+        "avg_technical": round(avg_technical, 2) if avg_technical is not None else None,
+        "avg_soft": round(avg_soft, 2) if avg_soft is not None else None,
+        "window_days": window_days,
+        "trend": round(recent - previous, 2) if recent is not None and previous is not None else None,
+    }
 
 
 @app.route('/contact')
+@cache_anonymous_page()
 def contact():
     return render_template('contact.html')
 
 
 @app.route('/help')
+@cache_anonymous_page()
 def help_page():
     return render_template('help.html')
 
-# ----------------------------
-# Chatbot Route (Gemini)
-# ----------------------------
-from flask import jsonify
-import google.generativeai as genai
-
-# Initialize Gemini (already imported above)
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-
 # ----------------------------
 # Resume Analysis
 # ----------------------------
@@ -209,18 +525,19 @@ def analyze():
         flash("No file selected.", "danger")
         return redirect(url_for('home'))
 
-    resume_path = os.path.join(UPLOAD_FOLDER, resume_file.filename)
-    jd_path = os.path.join(UPLOAD_FOLDER, jd_file.filename)
-    resume_file.save(resume_path)
-    jd_file.save(jd_path)
+    # Checked before the catch-all below so an unknown role is a 400 (unknown_role), not an error page
+    role = request.form.get('role')
+    if role:
+        role = role_packs.resolve(role)
 
     try:
-        if resume_path.endswith(".pdf"):
-            resume_text = extract_from_pdf(resume_path)
-        else:
-            resume_text = extract_from_docx(resume_path)
-        jd_text = load_job_description(jd_path)
-        results = analyze_resume(resume_path, jd_text)
+        resume_doc = parse_upload(resume_file)
+        jd_text = load_job_description(jd_file)
+        results = analyze_resume(resume_doc, jd_text, role=role)
+
+        user = User.query.filter_by(username=session['username']).first()
+        if user:
+            save_analysis_report(user.id, results, request.form.get('job_title') or job_title_from_filename(jd_file.filename))
 
         return render_template(
             "result.html",
@@ -238,48 +555,249 @@ def analyze():
     except Exception as e:
         return f"<h3 style='color:red;text-align:center;'>Error: {str(e)}</h3>"
 
-    finally:
-        os.remove(resume_path)
-        os.remove(jd_path)
+
+# ----------------------------
+# Skill aggregates
+# ----------------------------
+@app.route('/api/skills/<which>', methods=['GET'])
+def skill_aggregates(which):
+    """/api/skills/top-missing or /api/skills/top-matched?days=90&limit=10&scope=me|all&category=technical"""
+    if which not in ('top-missing', 'top-matched'):
+        return jsonify({"error": "Use top-missing or top-matched."}), 404
+    user = current_user()
+    if not user:
+        return jsonify({"error": "Login required."}), 401
+
+    days = request.args.get('days', 90, type=int)
+    limit = min(request.args.get('limit', 10, type=int), 100)
+    scope = request.args.get('scope', 'me')
+    category = request.args.get('category')
+    skills = top_skills(
+        matched=(which == 'top-matched'),
+        user_id=None if scope == 'all' else user.id,
+        days=days,
+        limit=limit,
+        category=category,
+    )
+    return jsonify({"days": days, "scope": scope, "category": category, "skills": skills})
 
 
 # ----------------------------
-# ATS Simulation (Gemini)
+# Batch Analysis (many resumes vs one JD, NDJSON)
 # ----------------------------
-@app.route('/ats-simulation', methods=['POST'])
-def ats_simulation():
-    """Simulate ATS score using Google Gemini API."""
-    import google.generativeai as genai
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
 
-    if 'username' not in session:
-        flash("You must be logged in to run ATS Simulation.", "danger")
-        return redirect(url_for('login'))
 
-    if 'resume' not in request.files or 'jd' not in request.files:
-        flash("Please upload both resume and job description.", "danger")
-        return redirect(url_for('home'))
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    return jsonify({"error": f"Uploads are limited to {MAX_UPLOAD_MB} MB per request."}), 413
 
-    resume_file = request.files['resume']
-    jd_file = request.files['jd']
 
-    resume_path = os.path.join(UPLOAD_FOLDER, resume_file.filename)
-    jd_path = os.path.join(UPLOAD_FOLDER, jd_file.filename)
-    resume_file.save(resume_path)
-    jd_file.save(jd_path)
+@app.errorhandler(UnknownRole)
+def unknown_role(e):
+    return jsonify({"error": str(e)}), 400
+
 
+@app.route('/api/analyze-batch', methods=['POST'])
+def analyze_batch():
+    """Rank many uploaded resumes against one JD as NDJSON.
+
+    One {"progress": {"done", "total"}, "filename", "overall_match"} line (or
+    "error") is streamed as each resume is scored, then one line per resume in
+    ranked order with its full results and "rank".
+    """
+    if 'username' not in session:
+        return jsonify({"error": "Login required."}), 401
+
+    resume_files = [f for f in request.files.getlist('resumes') if f.filename]
+    jd_file = request.files.get('jd')
+    if not resume_files or (not jd_file and not request.form.get('jd_text')):
+        return jsonify({"error": "Upload one or more 'resumes' and a 'jd' file (or 'jd_text')."}), 400
+    if len(resume_files) > BATCH_MAX_FILES:
+        return jsonify({"error": f"At most {BATCH_MAX_FILES} resumes per batch."}), 400
+
+    jd_text = load_job_description(jd_file) if jd_file else request.form['jd_text'].lower()
+    # Checked before streaming starts so a bad role is still a plain 400
+    role = role_packs.resolve(request.form['role']) if request.form.get('role') else None
+    semantic = request.form.get('semantic') in ('1', 'true', 'on')
+    # Flask closes uploads when the view returns, so read them now; MAX_CONTENT_LENGTH bounds the total
+    docs = []
+    for f in resume_files:
+        docs.append((f.filename, f.read()))
+        f.close()  # drop the spooled copy
+
+    def lines():
+        entries = []
+        for done, entry in enumerate(score_many(docs, jd_text, role=role, semantic=semantic), 1):
+            entries.append(entry)
+            progress = {"progress": {"done": done, "total": len(docs)}, "filename": entry["filename"]}
+            progress.update((k, entry[k]) for k in ("overall_match", "error") if k in entry)
+            yield json.dumps(progress) + "\n"
+        for entry in rank_entries(entries):
+            yield json.dumps(entry) + "\n"
+
+    return Response(stream_with_context(lines()), mimetype='application/x-ndjson')
+
+
+@app.route('/api/analyze-semantic', methods=['POST'])
+def analyze_semantic_api():
+    """Keyword analysis plus paraphrase matches and per-skill evidence sentences for one resume."""
+    if 'username' not in session:
+        return jsonify({"error": "Login required."}), 401
+
+    resume_file = request.files.get('resume')
+    jd_file = request.files.get('jd')
+    if not resume_file or not resume_file.filename or (not (jd_file and jd_file.filename) and not request.form.get('jd_text')):
+        return jsonify({"error": "Upload a 'resume' and a 'jd' file (or 'jd_text')."}), 400
+
+    jd_text = load_job_description(jd_file) if jd_file and jd_file.filename else request.form['jd_text'].lower()
+    role = role_packs.resolve(request.form['role']) if request.form.get('role') else None
     try:
-        # ✅ Configure Gemini with your API key
-        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        resume_doc = parse_upload(resume_file)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    results, semantic = analyze_semantic(resume_doc, jd_text, role=role)
+    return jsonify({"filename": resume_file.filename, "results": results, "semantic": semantic})
 
-        # ✅ Extract text
-        if resume_path.endswith(".pdf"):
-            resume_text = extract_from_pdf(resume_path)
-        else:
-            resume_text = extract_from_docx(resume_path)
-        jd_text = load_job_description(jd_path)
 
-        # ✅ Use Gemini for ATS scoring
-        prompt = f"""
+# ----------------------------
+# JD Library ("best matching jobs for this resume")
+# ----------------------------
+JD_LIBRARY_MAX_BATCH = int(os.getenv("JD_LIBRARY_MAX_BATCH", "1000"))
+jd_library_cache = JDLibraryCache()
+
+
+def set_jd_skills(jd, role=None):
+    """Extract and store the JD's weighted skills (role detected unless given)."""
+    keywords = extract_keywords(jd.text, role)
+    jd.role = keywords.role
+    jd.skills_json = json.dumps(keyword_skills(keywords))
+    jd.skills_digest = keywords.trie.digest
+
+
+def add_job_descriptions(entries, user_id=None):
+    """Insert library JDs from dicts with text and optional title/company/role; returns the rows."""
+    rows = []
+    for entry in entries:
+        jd = JobDescription(
+            title=(entry.get('title') or '')[:200] or None,
+            company=(entry.get('company') or '')[:200] or None,
+            text=entry['text'].lower(),
+            added_by=user_id,
+            role_explicit=bool(entry.get('role')),
+        )
+        set_jd_skills(jd, entry.get('role'))
+        rows.append(jd)
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+def jd_library():
+    """Inverted index over the JD table, rebuilt whenever rows are added, changed or removed."""
+    stamp = db.session.query(func.count(JobDescription.id), func.max(JobDescription.updated_at)).one()
+
+    def load():
+        rows = db.session.query(
+            JobDescription.id, JobDescription.title, JobDescription.company,
+            JobDescription.role, JobDescription.skills_json,
+        ).all()
+        return [
+            {"id": id_, "title": title, "company": company, "role": role, "skills": json.loads(skills)}
+            for id_, title, company, role, skills in rows
+        ]
+
+    return jd_library_cache.get(tuple(stamp), load)
+
+
+@app.route('/api/jd-library', methods=['POST'])
+def jd_library_add():
+    """Add JDs: a JSON object or list of {text, title?, company?, role?}, or an uploaded 'jd' file."""
+    user = current_user()
+    if not user:
+        return jsonify({"error": "Login required."}), 401
+
+    jd_file = request.files.get('jd')
+    if jd_file and jd_file.filename:
+        entries = [{
+            "text": load_job_description(jd_file),
+            "title": request.form.get('title') or job_title_from_filename(jd_file.filename),
+            "company": request.form.get('company'),
+            "role": request.form.get('role'),
+        }]
+    else:
+        payload = request.get_json(silent=True)
+        entries = payload if isinstance(payload, list) else [payload] if isinstance(payload, dict) else []
+    if not entries or not all(isinstance(e, dict) and (e.get('text') or '').strip() for e in entries):
+        return jsonify({"error": "Send JSON with a non-empty 'text' (or a list of them), or upload a 'jd' file."}), 400
+    if len(entries) > JD_LIBRARY_MAX_BATCH:
+        return jsonify({"error": f"At most {JD_LIBRARY_MAX_BATCH} JDs per request."}), 400
+    for entry in entries:
+        if entry.get('role'):
+            role_packs.resolve(entry['role'])
+
+    rows = add_job_descriptions(entries, user.id)
+    return jsonify({"added": [{"id": jd.id, "title": jd.title, "role": jd.role} for jd in rows]}), 201
+
+
+@app.route('/api/jd-library/match', methods=['POST'])
+def jd_library_match():
+    """Top JDs in the library for an uploaded 'resume' (or 'resume_text'), best first."""
+    if not current_user():
+        return jsonify({"error": "Login required."}), 401
+
+    resume_file = request.files.get('resume')
+    if resume_file and resume_file.filename:
+        resume = parse_upload(resume_file)
+    elif request.form.get('resume_text'):
+        resume = request.form['resume_text']
+    else:
+        return jsonify({"error": "Upload a 'resume' file or send 'resume_text'."}), 400
+    limit = max(1, min(request.args.get('limit', JD_MATCH_LIMIT, type=int), 100))
+
+    library = jd_library()
+    return jsonify({"total": len(library), "matches": library.top(resume, limit)})
+
+
+@app.cli.command('import-jds')
+@click.argument('directory')
+def import_jds_command(directory):
+    """Add every .txt job description in DIRECTORY to the JD library (title from the filename)."""
+    entries = []
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith('.txt'):
+            with open(os.path.join(directory, filename), encoding='utf-8', errors='replace') as f:
+                entries.append({"text": f.read(), "title": job_title_from_filename(filename)})
+    for start in range(0, len(entries), JD_LIBRARY_MAX_BATCH):
+        add_job_descriptions(entries[start:start + JD_LIBRARY_MAX_BATCH])
+    print(f"✅ Imported {len(entries)} job description(s) into the JD library.")
+
+
+@app.cli.command('reindex-jds')
+def reindex_jds_command():
+    """Re-extract library skills after the vocabulary, taxonomy or role packs change.
+
+    The role is detected again unless it was given explicitly when the JD was added.
+    """
+    updated, last_id = 0, 0
+    while True:
+        rows = (JobDescription.query.filter(JobDescription.id > last_id)
+                .order_by(JobDescription.id).limit(JD_LIBRARY_MAX_BATCH).all())
+        if not rows:
+            break
+        for jd in rows:
+            set_jd_skills(jd, jd.role if jd.role_explicit else None)
+        db.session.commit()
+        updated += len(rows)
+        last_id = rows[-1].id
+    print(f"✅ Re-extracted skills for {updated} job description(s).")
+
+
+# ----------------------------
+# ATS Simulation (Gemini)
+# ----------------------------
+def build_ats_prompt(resume_text, jd_text):
+    return f"""
         You are an ATS (Applicant Tracking System) evaluator.
         Compare the following RESUME and JOB DESCRIPTION, and give a score (0-100)
         based on how well the resume matches the job requirements.
@@ -296,41 +814,39 @@ def ats_simulation():
         Summary: <short explanation>
         """
 
-        model = genai.GenerativeModel("models/gemini-2.5-flash-preview-09-2025")
 
-        response = model.generate_content(prompt)
-
-        ats_result = response.text if hasattr(response, "text") else str(response)
+@app.route('/ats-simulation', methods=['POST'])
+def ats_simulation():
+    """Queue an ATS simulation (Gemini) and send the user to its status page."""
+    if 'username' not in session:
+        flash("You must be logged in to run ATS Simulation.", "danger")
+        return redirect(url_for('login'))
 
-        return render_template('ats_result.html', ats_result=ats_result)
+    if 'resume' not in request.files or 'jd' not in request.files:
+        flash("Please upload both resume and job description.", "danger")
+        return redirect(url_for('home'))
+    if not llm:
+        flash("AI features require GEMINI_API_KEY.", "danger")
+        return redirect(url_for('home'))
 
+    try:
+        job_id = submit_upload_job('ats-simulation', current_user(), request.files['resume'], request.files['jd'])
     except Exception as e:
         flash(f"Error running ATS simulation: {e}", "danger")
         return redirect(url_for('home'))
-
-    finally:
-        os.remove(resume_path)
-        os.remove(jd_path)
+    return redirect(url_for('job_page', job_id=job_id))
 
 # ----------------------------
 # Chatbot Route (Gemini)
 # ----------------------------
 from flask import jsonify
-import google.generativeai as genai
-
-# Initialize Gemini client
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
-@app.route('/chat', methods=['POST'])
-def chat():
-    try:
-        user_message = request.json.get("message", "").strip()
+CHAT_MAX_WORDS = 50
 
-        if not user_message:
-            return jsonify({"reply": "Please type a message."})
 
-        # ✅ Create a concise system-style prompt for Gemini
-        prompt = f"""
+def build_chat_prompt(user_message):
+    # ✅ Create a concise system-style prompt for Gemini
+    return f"""
         You are SkillSync, a concise and professional AI assistant that helps users with resume improvement,
         job suggestions, and interview tips.
 
@@ -344,23 +860,97 @@ def chat():
         User: {user_message}
         """
 
-        # Use Gemini model for chatbot
-        model = genai.GenerativeModel("models/gemini-2.5-flash-preview-09-2025")
-        response = model.generate_content(prompt)
 
-        bot_reply = response.text.strip() if hasattr(response, "text") else str(response)
+@app.route('/chat', methods=['POST'])
+def chat():
+    try:
+        user_message = request.json.get("message", "").strip()
+
+        if not user_message:
+            return jsonify({"reply": "Please type a message."})
+
+        prompt = build_chat_prompt(user_message)
+
+        if not llm:
+            return jsonify({"reply": "AI chat requires GEMINI_API_KEY."})
+
+        # Use the shared Gemini client for chatbot
+        bot_reply = llm.generate(prompt).text.strip()
 
         # ✅ Optional: Trim very long replies to stay concise
-        if len(bot_reply.split()) > 50:
-            bot_reply = " ".join(bot_reply.split()[:50]) + "..."
+        if len(bot_reply.split()) > CHAT_MAX_WORDS:
+            bot_reply = " ".join(bot_reply.split()[:CHAT_MAX_WORDS]) + "..."
 
         return jsonify({"reply": bot_reply})
 
     except Exception as e:
         print("❌ Chatbot error:", e)
         return jsonify({"reply": f"Error: {str(e)}"})
+
+
+def cap_words(chunks, max_words):
+    """Pass streamed text through until max_words words have been emitted, then add '...'.
+
+    The upstream generator is closed as soon as the cap is hit (or this one is
+    closed), which ends the Gemini stream and frees its concurrency slot.
+    """
+    emitted = 0
+    in_word = False
+    try:
+        for chunk in chunks:
+            out = []
+            for piece in re.findall(r"\s+|\S+", chunk):
+                if piece.isspace():
+                    in_word = False
+                elif not in_word:
+                    if emitted == max_words:
+                        yield "".join(out).rstrip() + "..."
+                        return
+                    emitted += 1
+                    in_word = True
+                out.append(piece)
+            if out:
+                yield "".join(out)
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def sse_event(data, event=None):
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@app.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    """Server-Sent Events variant of /chat: forwards Gemini tokens as they arrive."""
+    user_message = (request.get_json(silent=True) or {}).get("message", "").strip()
+
+    def events(chunks):
+        try:
+            for text in cap_words(chunks, CHAT_MAX_WORDS):
+                yield sse_event({"delta": text})
+        except Exception as e:
+            print("❌ Chatbot stream error:", e)
+            yield sse_event({"error": str(e)}, event="error")
+        yield sse_event({}, event="done")
+
+    if not user_message:
+        chunks = iter(["Please type a message."])
+    elif not llm:
+        chunks = iter(["AI chat requires GEMINI_API_KEY."])
+    else:
+        chunks = llm.stream(build_chat_prompt(user_message))
+
+    return Response(
+        stream_with_context(events(chunks)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 from flask import jsonify
-import google.generativeai as genai
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 
@@ -414,15 +1004,21 @@ def generate_summary():
         flash("Please enter some key points.", "danger")
         return redirect(url_for('home'))
 
+    if not llm:
+        flash("AI features require GEMINI_API_KEY.", "danger")
+        return redirect(url_for('home'))
+
     prompt = f"""
     Write a professional and concise 'About Me' summary 
     (max 4 sentences) based on these points:
     {summary_input}
     """
 
-    model = genai.GenerativeModel("models/gemini-2.5-flash-preview-09-2025")
-    response = model.generate_content(prompt)
-    result = response.text.strip()
+    try:
+        result = llm.generate(prompt).text.strip()
+    except Exception as e:
+        flash(f"Error generating summary: {str(e)}", "danger")
+        return redirect(url_for('home'))
 
     return render_template("summary_result.html", summary=result)
 
@@ -452,12 +1048,9 @@ def enhance_bullets():
         Format output as a list of improved bullet points.
         """
 
-        import google.generativeai as genai
-        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-        model = genai.GenerativeModel("models/gemini-2.5-flash-preview-09-2025")
-        response = model.generate_content(prompt)
-
-        enhanced_text = response.text if hasattr(response, "text") else str(response)
+        if not llm:
+            raise RuntimeError("AI features require GEMINI_API_KEY.")
+        enhanced_text = llm.generate(prompt).text
 
         # Render the result page
         return render_template("enhance_result.html", enhanced_text=enhanced_text)
@@ -466,91 +1059,82 @@ def enhance_bullets():
         flash(f"Error enhancing bullets: {str(e)}", "danger")
         return redirect(url_for('home'))
 
-import pdfkit
-from io import BytesIO
-
-import pdfkit
-from io import BytesIO
+from pdf_renderer import get_renderer
+from render_cache import render_cache
+from live_preview import PreviewSessions, affected_blocks, block_dependencies, render_blocks
+from template_registry import TemplateRegistry, UnknownTemplate
+
+# Resume templates are compiled once here; requests only ever look them up by name
+resume_templates = TemplateRegistry(app.jinja_env)
+_prebuilt = resume_templates.load()
+print(f"✅ Resume templates loaded: {', '.join(resume_templates.names)}"
+      + (f" ({len(_prebuilt)} prebuilt)" if _prebuilt else ""))
+
+
+@app.errorhandler(UnknownTemplate)
+def unknown_template(e):
+    return jsonify({"error": str(e)}), 400
+
+
+@app.cli.command('build-templates')
+def build_templates_command():
+    """Precompile the resume templates (CSS inlined and minified) into Python modules."""
+    manifest = resume_templates.build()
+    print(f"✅ Compiled {len(manifest)} template(s) into {resume_templates.compiled_dir}")
+
+RESUME_LIST_FIELDS = ("skills", "experience", "education", "projects", "awards", "languages", "certifications")
+
+
+# Helper to normalize lists
+def normalize_list(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except:
+            # split by newlines or commas
+            if '\n' in value:
+                return [v.strip() for v in value.split('\n') if v.strip()]
+            if ',' in value:
+                return [v.strip() for v in value.split(',') if v.strip()]
+            return [value.strip()]
+    return value
+
+
+def resume_context(payload):
+    """Template variables for a resume editor payload (JSON body or form fields)."""
+    context = {field: payload.get(field, '') for field in ("name", "email", "phone", "linkedin", "summary")}
+    for field in RESUME_LIST_FIELDS:
+        context[field] = normalize_list(payload.get(field))
+    return context
+
+
+def render_resume(payload):
+    """Rendered resume HTML and its ETag, served from render_cache when the payload repeats."""
+    name = resume_templates.resolve(payload.get('template'))
+    # The template's source digest is part of the key so a rebuilt template is never served stale
+    return render_cache.get_html(
+        f"{name}@{resume_templates.version(name)}",
+        resume_context(payload),
+        lambda _, context: resume_templates.render(name, context),
+    )
 
-from flask import request, send_file, jsonify
-from io import BytesIO
-import pdfkit
-import json
 
 @app.route('/generate-template-pdf', methods=['POST'])
 def generate_template_pdf():
-    import json
-    from io import BytesIO
-    import pdfkit
-
     # Receive data
     if request.is_json:
         payload = request.get_json()
     else:
         payload = request.form.to_dict(flat=True)
 
-    # Helper to normalize lists
-    def normalize(value):
-        if not value:
-            return []
-        if isinstance(value, str):
-            try:
-                return json.loads(value)
-            except:
-                # split by newlines or commas
-                if '\n' in value:
-                    return [v.strip() for v in value.split('\n') if v.strip()]
-                if ',' in value:
-                    return [v.strip() for v in value.split(',') if v.strip()]
-                return [value.strip()]
-        return value
-
-    # Normalize all user-entered lists
-    skills = normalize(payload.get('skills'))
-    experience = normalize(payload.get('experience'))
-    education = normalize(payload.get('education'))
-    projects = normalize(payload.get('projects'))
-    awards = normalize(payload.get('awards'))
-    languages = normalize(payload.get('languages'))
-    certifications = normalize(payload.get('certifications'))
-
-    html = render_template(
-        f"resume_templates/{payload.get('template', 'modern')}.html",
-        name=payload.get('name', ''),
-        email=payload.get('email', ''),
-        phone=payload.get('phone', ''),
-        linkedin=payload.get('linkedin', ''),
-        summary=payload.get('summary', ''),
-        skills=skills,
-        experience=experience,
-        education=education,
-        projects=projects,
-        awards=awards,
-        languages=languages,
-        certifications=certifications
-    )
+    html, etag = render_resume(payload)
 
-    # Generate PDF with color preservation options
+    # Render on the shared, warm renderer pool (WeasyPrint in-process, wkhtmltopdf fallback);
+    # identical HTML is only rasterized once
     try:
-        config = pdfkit.configuration(
-            wkhtmltopdf=r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe"
-        )
-        # Options to preserve colors and styling
-        options = {
-            'page-size': 'Letter',
-            'margin-top': '0.5in',
-            'margin-right': '0.5in',
-            'margin-bottom': '0.5in',
-            'margin-left': '0.5in',
-            'encoding': "UTF-8",
-            'no-outline': None,
-            'enable-local-file-access': None,
-            'print-media-type': None,  # Use print media queries (preserves colors)
-            'disable-smart-shrinking': None,
-            # Ensure colors are preserved (wkhtmltopdf preserves colors by default)
-            # The key is using print-media-type and ensuring CSS colors are properly defined
-        }
-        pdf = pdfkit.from_string(html, False, configuration=config, options=options)
+        pdf = render_cache.get_pdf(html, get_renderer().render, digest=etag)
     except Exception as e:
         print("❌ PDF Generation Error:", e)
         return {"error": str(e)}, 500
@@ -558,11 +1142,13 @@ def generate_template_pdf():
     buf = BytesIO(pdf)
     buf.seek(0)
     filename = f"{payload.get('name', 'resume')}.pdf"
-    return send_file(buf, as_attachment=True, download_name=filename, mimetype='application/pdf')
+    response = send_file(buf, as_attachment=True, download_name=filename, mimetype='application/pdf')
+    response.set_etag(etag)
+    return response
 
 @app.route('/api/generate-bullets', methods=['POST'])
 def api_generate_bullets():
-    if not api_key or not model:
+    if not llm:
         return jsonify({"error": "AI features require GEMINI_API_KEY. Please add it to your .env file."}), 503
     
     # expects JSON: {"title":"Cashier", "industry":"Retail", "level":"entry"}
@@ -572,24 +1158,30 @@ def api_generate_bullets():
     level = data.get("level","mid")
     # prompt for Gemini (keep short)
     prompt = f"Write 6 concise resume bullet points for a {level} {title} in {industry}. Include measurable outcomes when possible. Keep each bullet under 18 words."
-    response = model.generate_content(prompt)
-    bullets = response.text.strip() if hasattr(response, "text") else str(response)
-    return jsonify({"bullets": bullets.splitlines()})
+    try:
+        response = llm.generate(prompt, cache=True)
+    except LLMError as e:
+        return jsonify({"error": str(e)}), 503
+    bullets = response.text.strip()
+    return jsonify({"bullets": bullets.splitlines(), "cached": response.cached})
 @app.route('/api/rewrite-bullet', methods=['POST'])
 def api_rewrite_bullet():
-    if not api_key or not model:
+    if not llm:
         return jsonify({"error": "AI features require GEMINI_API_KEY. Please add it to your .env file."}), 503
     
     data = request.get_json() or {}
     bullet = data.get("bullet","")
     prompt = f"Rewrite this resume bullet to be more results-oriented and concise (max 18 words):\n\n{bullet}"
-    response = model.generate_content(prompt)
-    new_bullet = response.text.strip() if hasattr(response, "text") else str(response)
-    return jsonify({"bullet": new_bullet})
+    try:
+        response = llm.generate(prompt, cache=True)
+    except LLMError as e:
+        return jsonify({"error": str(e)}), 503
+    new_bullet = response.text.strip()
+    return jsonify({"bullet": new_bullet, "cached": response.cached})
 
 @app.route('/api/suggest-skills', methods=['POST'])
 def api_suggest_skills():
-    if not api_key or not model:
+    if not llm:
         return jsonify({"error": "AI features require GEMINI_API_KEY. Please add it to your .env file."}), 503
     
     data = request.get_json() or {}
@@ -604,12 +1196,12 @@ def api_suggest_skills():
     Return only a comma-separated list of skills, no explanations or additional text."""
     
     try:
-        response = model.generate_content(prompt)
-        skills_text = response.text.strip() if hasattr(response, "text") else str(response)
+        response = llm.generate(prompt, cache=True)
+        skills_text = response.text.strip()
         # Clean up the response - remove any markdown, bullets, or extra formatting
         skills_text = skills_text.replace('*', '').replace('-', '').replace('•', '').strip()
         skills_list = [s.strip() for s in skills_text.split(',') if s.strip()]
-        return jsonify({"skills": skills_list})
+        return jsonify({"skills": skills_list, "cached": response.cached})
     except Exception as e:
         print(f"❌ Error suggesting skills: {e}")
         return jsonify({"error": str(e)}), 500
@@ -617,30 +1209,55 @@ def api_suggest_skills():
 @app.route('/preview', methods=['POST'])
 def preview():
     data = request.get_json() or {}
-    # normalize lists:
-    skills = data.get('skills') or []
-    experience = data.get('experience') or []
-    education = data.get('education') or []
-    projects = data.get('projects') or []
-    awards = data.get('awards') or []
-    languages = data.get('languages') or []
-    certifications = data.get('certifications') or []
-    html = render_template(
-        f"resume_templates/{data.get('template','modern')}.html",
-        name=data.get('name',''),
-        email=data.get('email',''),
-        phone=data.get('phone',''),
-        linkedin=data.get('linkedin',''),
-        summary=data.get('summary',''),
-        skills=skills,
-        experience=experience,
-        education=education,
-        projects=projects,
-        awards=awards,
-        languages=languages,
-        certifications=certifications
-    )
-    return html
+    html, etag = render_resume(data)
+    # The editor sends back the ETag of what it is showing; unchanged content needs no body
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(html, mimetype='text/html')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+preview_sessions = PreviewSessions()
+preview_sessions.init_app(db, PreviewState)
+
+
+@app.route('/preview/live', methods=['POST'])
+def preview_live():
+    """Live preview: the editor sends only changed fields and gets back re-rendered blocks.
+
+    First request (or after {"resync": true}): {"payload": {...}} -> {"session", "version", "html"}.
+    Then: {"session", "version", "changes": {...}} -> {"session", "version", "blocks": {name: html}}.
+    """
+    data = request.get_json() or {}
+
+    if 'payload' in data:
+        payload = data['payload'] or {}
+        html, _ = render_resume(payload)
+        session_id, session = preview_sessions.start(resume_templates.resolve(payload.get('template')), payload)
+        return jsonify({"session": session_id, "version": session.version, "html": html})
+
+    changes = data.get('changes') or {}
+    if 'template' in changes:
+        resume_templates.resolve(changes['template'])
+    session_id = data.get('session')
+    session, changed = preview_sessions.apply(session_id, data.get('version'), changes)
+    if session is None:
+        return jsonify({"resync": True})
+
+    if 'template' in changed:
+        html, _ = render_resume(session.payload)
+        return jsonify({"session": session_id, "version": session.version, "html": html})
+
+    dependencies = block_dependencies(resume_templates.env, resume_templates.source(session.template))
+    blocks = affected_blocks(dependencies, changed)
+    if blocks is None:
+        html, _ = render_resume(session.payload)
+        return jsonify({"session": session_id, "version": session.version, "html": html})
+    rendered = render_blocks(resume_templates.get(session.template), blocks, resume_context(session.payload))
+    return jsonify({"session": session_id, "version": session.version, "blocks": rendered})
 
 @app.route('/resume-editor')
 def resume_editor():
@@ -648,8 +1265,7 @@ def resume_editor():
 
 @app.route('/resume-builder', methods=['POST'])
 def resume_builder():
-    print("🧩 /resume-builder route HIT ✅")
-    """Handles resume builder suggestions and generates a PDF suggestion report."""
+    """Queue a PDF suggestion report and send the user to its status page."""
     if 'username' not in session:
         flash("You must be logged in to use the Resume Builder.", "danger")
         return redirect(url_for('login'))
@@ -665,41 +1281,135 @@ def resume_builder():
         flash("No file selected.", "danger")
         return redirect(url_for('home'))
 
-    resume_path = os.path.join(UPLOAD_FOLDER, resume_file.filename)
-    jd_path = os.path.join(UPLOAD_FOLDER, jd_file.filename)
-    resume_file.save(resume_path)
-    jd_file.save(jd_path)
-
     try:
-        jd_text = load_job_description(jd_path)
-        results = analyze_resume(resume_path, jd_text)
-        from analyzer import build_resume_suggestions
-        suggestions = build_resume_suggestions(results)
+        job_id = submit_upload_job('resume-builder', current_user(), resume_file, jd_file)
+    except Exception as e:
+        flash(f"Error generating suggestion report: {e}", "danger")
+        return redirect(url_for('home'))
+    return redirect(url_for('job_page', job_id=job_id))
 
-        # ✅ Generate PDF Suggestion Report
-        output_path = os.path.join(UPLOAD_FOLDER, f"{resume_file.filename}_suggestions.pdf")
+# ----------------------------
+# Background jobs (ATS simulation / suggestion reports)
+# ----------------------------
+@job_queue.handler('ats-simulation')
+def run_ats_simulation_job(user_id, resume_bytes, resume_filename, jd_text, job_title=None):
+    if not llm:
+        raise RuntimeError("AI features require GEMINI_API_KEY.")
+    resume_doc = parse_bytes(resume_bytes, resume_filename)
+    ats_result = llm.generate(build_ats_prompt(resume_doc.text, jd_text)).text
+    return {"ats_result": ats_result}
+
+
+@job_queue.handler('resume-builder')
+def run_resume_builder_job(user_id, resume_bytes, resume_filename, jd_text, job_title=None):
+    resume_doc = parse_bytes(resume_bytes, resume_filename)
+    results = analyze_resume(resume_doc, jd_text)
+    save_analysis_report(user_id, results, job_title)
+
+    pdf = generate_pdf_report(
+        filename=resume_filename,
+        technical_match=results["technical"]["match_percent"],
+        technical_matched=results["technical"]["matched"],
+        technical_missing=results["technical"]["missing"],
+        soft_match=results["soft"]["match_percent"],
+        soft_matched=results["soft"]["matched"],
+        soft_missing=results["soft"]["missing"]
+    )
+    return {
+        "file": pdf,
+        "filename": f"{resume_filename}_suggestions.pdf",
+        "mimetype": "application/pdf",
+        "technical_match": results["technical"]["match_percent"],
+        "soft_match": results["soft"]["match_percent"],
+    }
 
-        generate_pdf_report(
-            filename=resume_file.filename,
-            technical_match=results["technical"]["match_percent"],
-            technical_matched=results["technical"]["matched"],
-            technical_missing=results["technical"]["missing"],
-            output_path=output_path,
-            soft_match=results["soft"]["match_percent"],
-            soft_matched=results["soft"]["matched"],
-            soft_missing=results["soft"]["missing"]
-        )
 
-        flash("✅ Suggestion report generated successfully!", "success")
-        return send_file(output_path, as_attachment=True)
+def current_user():
+    if 'username' not in session:
+        return None
+    return User.query.filter_by(username=session['username']).first()
+
+
+def submit_upload_job(kind, user, resume_file, jd_file):
+    """Queue a job for an uploaded resume + JD; only the raw bytes and JD text are read here."""
+    return job_queue.submit(
+        kind,
+        owner_id=user.id,
+        user_id=user.id,
+        resume_bytes=resume_file.read(),
+        resume_filename=resume_file.filename,
+        jd_text=load_job_description(jd_file),
+        job_title=request.form.get('job_title') or job_title_from_filename(jd_file.filename),
+    )
 
-    except Exception as e:
-        flash(f"Error generating suggestion report: {e}", "danger")
-        return redirect(url_for('home'))
 
-    finally:
-        os.remove(resume_path)
-        os.remove(jd_path)
+@app.route('/api/jobs/<kind>', methods=['POST'])
+def submit_job(kind):
+    """Queue an ATS simulation or suggestion report and return its job id straight away."""
+    user = current_user()
+    if not user:
+        return jsonify({"error": "Login required."}), 401
+    if kind not in job_queue.handlers:
+        return jsonify({"error": f"Unknown job type: {kind}"}), 404
+
+    resume_file = request.files.get('resume')
+    jd_file = request.files.get('jd')
+    if not resume_file or not jd_file or resume_file.filename == '' or jd_file.filename == '':
+        return jsonify({"error": "Please upload both resume and job description."}), 400
+
+    job_id = submit_upload_job(kind, user, resume_file, jd_file)
+    return jsonify({
+        "job_id": job_id,
+        "status_url": url_for('job_status', job_id=job_id),
+        "result_url": url_for('job_result', job_id=job_id),
+    }), 202
+
+
+def get_user_job(job_id):
+    user = current_user()
+    if not user:
+        return None
+    return Job.query.filter_by(id=job_id, user_id=user.id).first()
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = get_user_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found."}), 404
+    return jsonify(job_to_dict(job))
+
+
+@app.route('/jobs/<job_id>')
+def job_page(job_id):
+    """Status page for a queued form submission; polls /api/jobs/<id> and shows the result when done."""
+    if 'username' not in session:
+        return redirect(url_for('login'))
+    job = get_user_job(job_id)
+    if not job:
+        flash("Job not found.", "danger")
+        return redirect(url_for('dashboard'))
+    if job.status == 'done' and job.kind == 'ats-simulation':
+        return render_template('ats_result.html', ats_result=job_to_dict(job)["result"]["ats_result"])
+    return render_template('job_status.html', job=job_to_dict(job))
+
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    job = get_user_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found."}), 404
+    if job.status != 'done':
+        return jsonify(job_to_dict(job)), 202 if job.status in ('queued', 'running') else 500
+    if job.result_file is not None:
+        return send_file(
+            BytesIO(job.result_file),
+            as_attachment=True,
+            download_name=job.result_filename or f"{job.kind}.bin",
+            mimetype=job.result_mimetype or 'application/octet-stream',
+        )
+    return jsonify(job_to_dict(job)["result"])
+
 
 # ----------------------------
 # Run App
@@ -0,0 +1,198 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+from io import BytesIO
+
+from flask import request, send_from_directory, url_for
+from markupsafe import Markup, escape
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # .br variants are skipped; gzip still works
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+# Output of `flask build-assets`; served under /assets/ with far-future caching
+ASSET_DIR = os.getenv("ASSET_DIR", os.path.join(STATIC_DIR, "dist"))
+MANIFEST_NAME = "manifest.json"
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+
+# Images to convert: largest edge in pixels (None keeps the original size)
+IMAGES = {
+    "background.png": None,
+    "logo.png": 128,  # shown at 40px in the navbar; 128px covers 3x displays and the favicon
+}
+# Modern formats offered before the PNG fallback, best first: (format, MIME type, Pillow save options)
+IMAGE_FORMATS = [
+    ("avif", "image/avif", {"quality": 50}),
+    ("webp", "image/webp", {"quality": 80, "method": 6}),
+]
+TEXT_EXTENSIONS = (".js", ".css")
+# Precompressed variants, in server preference order
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+def fingerprint(name, data):
+    """background.png + bytes -> background.<hash>.png"""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+
+
+# ----------------------------
+# Build step
+# ----------------------------
+def _write(out_dir, name, data):
+    path = os.path.join(out_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _encode_image(im, fmt, options):
+    buf = BytesIO()
+    im.save(buf, format=fmt.upper(), **options)
+    return buf.getvalue()
+
+
+def _build_image(name, max_size, static_dir, out_dir):
+    from PIL import Image
+
+    with Image.open(os.path.join(static_dir, name)) as im:
+        im.load()
+        if max_size:
+            im.thumbnail((max_size, max_size), Image.LANCZOS)
+        entry = {"sources": []}
+        for fmt, mimetype, options in IMAGE_FORMATS:
+            try:
+                data = _encode_image(im, fmt, options)
+            except (KeyError, OSError) as e:  # this Pillow build lacks the encoder
+                print(f"⚠️  Skipping {fmt} for {name}: {e}")
+                continue
+            path = fingerprint(os.path.splitext(name)[0] + "." + fmt, data)
+            _write(out_dir, path, data)
+            entry["sources"].append({"path": path, "type": mimetype})
+        fallback = _encode_image(im, "png", {"optimize": True})
+    entry["file"] = fingerprint(name, fallback)
+    _write(out_dir, entry["file"], fallback)
+    return entry
+
+
+def _build_text(name, static_dir, out_dir):
+    with open(os.path.join(static_dir, name), "rb") as f:
+        data = f.read()
+    path = fingerprint(name, data)
+    _write(out_dir, path, data)
+    encodings = []
+    if data:
+        _write(out_dir, path + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+        encodings.append("gzip")
+        if brotli is not None:
+            _write(out_dir, path + ".br", brotli.compress(data, quality=11))
+            encodings.append("br")
+    return {"file": path, "encodings": encodings}
+
+
+def build_assets(static_dir=STATIC_DIR, out_dir=ASSET_DIR):
+    """Write converted images, fingerprinted JS/CSS (+ .gz/.br) and the manifest; returns the manifest."""
+    manifest = {}
+    for name, max_size in IMAGES.items():
+        if os.path.exists(os.path.join(static_dir, name)):
+            manifest[name] = _build_image(name, max_size, static_dir, out_dir)
+
+    out_real = os.path.realpath(out_dir)
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = [d for d in dirs if os.path.realpath(os.path.join(root, d)) != out_real]
+        for filename in sorted(files):
+            if filename.endswith(TEXT_EXTENSIONS):
+                name = os.path.relpath(os.path.join(root, filename), static_dir).replace(os.sep, "/")
+                manifest[name] = _build_text(name, static_dir, out_dir)
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+# ----------------------------
+# Serving + template helpers
+# ----------------------------
+class Assets:
+    """Maps logical static names to built, fingerprinted files and serves them.
+
+    Until `flask build-assets` has been run the helpers fall back to the plain
+    files under /static, so templates work either way.
+    """
+
+    def __init__(self, asset_dir=ASSET_DIR):
+        self.asset_dir = asset_dir
+        self.manifest = {}
+
+    def init_app(self, app):
+        self.manifest = self.load_manifest()
+        app.add_url_rule("/assets/<path:filename>", "asset", self.send)
+        app.jinja_env.globals.update(
+            asset_url=self.url,
+            asset_image_set=self.image_set,
+            asset_picture=self.picture,
+        )
+
+    def load_manifest(self):
+        try:
+            with open(os.path.join(self.asset_dir, MANIFEST_NAME), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def url(self, name):
+        entry = self.manifest.get(name)
+        if entry is None:
+            return url_for("static", filename=name)
+        return url_for("asset", filename=entry["file"])
+
+    def sources(self, name):
+        """[(url, MIME type)] of the modern image formats for this asset, best first."""
+        entry = self.manifest.get(name) or {}
+        return [(url_for("asset", filename=s["path"]), s["type"]) for s in entry.get("sources", [])]
+
+    def image_set(self, name):
+        """CSS value for background-image: image-set() of every format, with the PNG last."""
+        fallback = self.url(name)
+        options = [f'url("{url}") type("{mimetype}")' for url, mimetype in self.sources(name)]
+        if not options:
+            return Markup(f'url("{fallback}")')
+        options.append(f'url("{fallback}") type("{mimetypes.guess_type(name)[0]}")')
+        return Markup(f"image-set({', '.join(options)})")
+
+    def picture(self, name, **attrs):
+        """<picture> offering AVIF/WebP with an <img> fallback carrying `attrs`."""
+        attributes = "".join(f' {key}="{escape(value)}"' for key, value in attrs.items())
+        parts = [f'<source srcset="{url}" type="{mimetype}">' for url, mimetype in self.sources(name)]
+        parts.append(f'<img src="{self.url(name)}"{attributes}>')
+        return Markup(f"<picture>{''.join(parts)}</picture>")
+
+    def send(self, filename):
+        """Serve a built asset, using a precompressed variant when the client accepts it."""
+        path = safe_join(self.asset_dir, filename)
+        if path is None or filename == MANIFEST_NAME or not os.path.isfile(path):
+            raise NotFound()
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        encoding = None
+        compressible = filename.endswith(TEXT_EXTENSIONS)
+        if compressible:
+            for name, ext in ENCODINGS:
+                if name in request.accept_encodings and os.path.isfile(path + ext):
+                    encoding, filename = name, filename + ext
+                    break
+        response = send_from_directory(self.asset_dir, filename, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        if compressible:
+            response.vary.add("Accept-Encoding")
+        if encoding:
+            response.content_encoding = encoding
+        return response
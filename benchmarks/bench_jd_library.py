@@ -0,0 +1,90 @@
+"""Time to rank a synthetic JD library for one resume ("top 20 jobs").
+
+Usage:
+    python benchmarks/bench_jd_library.py --jds 10000 --queries 50
+
+Builds --jds synthetic job descriptions from the role packs' skills, extracts
+their weighted skills with analyzer.extract_keywords (as POST /api/jd-library
+does), builds the in-memory inverted index, then times JDLibrary.top() for
+resumes of different roles. No database is involved.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ROLES = ["swe", "data_science", "qa", "retail"]
+TITLES = {
+    "swe": "Software Engineer", "data_science": "Data Scientist",
+    "qa": "QA Engineer", "retail": "Retail Sales Associate",
+}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def role_skills(role):
+    with open(os.path.join(ROOT, "data", "roles", f"{role}.json"), encoding="utf-8") as f:
+        return json.load(f)["skills"]
+
+
+def synthetic_jd(rng, role, skills):
+    picked = rng.sample(skills, rng.randint(6, 14))
+    lines = [f"{TITLES[role]} wanted."] + [f"Experience with {skill} is required." for skill in picked]
+    lines += [f"Strong {skill} preferred." for skill in rng.sample(picked, 3)]
+    return " ".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jds", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    from analyzer import extract_keywords
+    from jd_library import JDLibrary, keyword_skills
+
+    rng = random.Random(args.seed)
+    skills = {role: role_skills(role) for role in ROLES}
+
+    start = time.perf_counter()
+    rows = []
+    for i in range(args.jds):
+        role = ROLES[i % len(ROLES)]
+        keywords = extract_keywords(synthetic_jd(rng, role, skills[role]))
+        rows.append({"id": i, "title": TITLES[role], "company": None,
+                     "role": keywords.role, "skills": keyword_skills(keywords)})
+    extract_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    library = JDLibrary(rows)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    resumes = [" ".join(rng.sample(skills[role], 20)) + " teamwork communication" for role in ROLES]
+    timings = []
+    for q in range(args.queries):
+        start = time.perf_counter()
+        library.top(resumes[q % len(resumes)], 20)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    print(f"\n📊 {len(library)} JDs, {len(library.postings)} postings lists\n")
+    print(f"extract skills : {extract_s:.1f} s ({extract_s / args.jds * 1000:.2f} ms/JD)")
+    print(f"build index    : {build_ms:.1f} ms")
+    print(f"top 20 query   : mean {statistics.mean(timings):.2f} ms, p50 {percentile(timings, 50):.2f} ms, "
+          f"p99 {percentile(timings, 99):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
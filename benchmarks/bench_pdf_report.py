@@ -0,0 +1,86 @@
+"""Per-report time and output size of the PDF suggestion report.
+
+Usage:
+    python benchmarks/bench_pdf_report.py --runs 50
+    python benchmarks/bench_pdf_report.py --runs 50 --baseline <git-rev>
+
+Times pdf_report.generate_pdf_report building reports in memory. With
+--baseline, pdf_report.py is also loaded from that git revision (e.g. the
+commit before styles and the logo were cached) and measured the same way,
+so both implementations are compared in one run.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import types
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # older revisions open "static/logo.png" relative to the working directory
+
+REPORT = dict(
+    filename="jane_doe_resume.pdf",
+    technical_match=62.5,
+    technical_matched=["python", "sql", "flask", "docker", "git"],
+    technical_missing=["kubernetes", "aws", "terraform"],
+    soft_match=50.0,
+    soft_matched=["communication", "teamwork"],
+    soft_missing=["leadership", "time management"],
+)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def load_baseline(rev):
+    source = subprocess.run(
+        ["git", "show", f"{rev}:pdf_report.py"], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    module = types.ModuleType(f"pdf_report_{rev}")
+    module.__file__ = os.path.join(ROOT, "pdf_report.py")
+    exec(compile(source, f"pdf_report.py@{rev}", "exec"), module.__dict__)
+    return module
+
+
+def run(generate, runs):
+    """Per-report timings in ms and the size of the last report in bytes."""
+    timings, size = [], 0
+    for _ in range(runs):
+        buf = BytesIO()
+        start = time.perf_counter()
+        generate(**REPORT, output_path=buf)
+        timings.append((time.perf_counter() - start) * 1000)
+        size = len(buf.getvalue())
+    return timings, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--baseline", help="git revision of pdf_report.py to compare against")
+    args = parser.parse_args()
+
+    import pdf_report
+    implementations = [("current", pdf_report.generate_pdf_report)]
+    if args.baseline:
+        implementations.insert(0, (f"baseline ({args.baseline})", load_baseline(args.baseline).generate_pdf_report))
+
+    print(f"\n📊 {args.runs} report(s) per implementation\n")
+    print(f"{'implementation':<24} {'mean ms':>9} {'p50 ms':>8} {'p99 ms':>8} {'size KB':>9}")
+    for name, generate in implementations:
+        timings, size = run(generate, args.runs)
+        print(f"{name:<24} {statistics.mean(timings):>9.1f} {percentile(timings, 50):>8.1f} "
+              f"{percentile(timings, 99):>8.1f} {size / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Throughput of the semantic scoring mode.
+
+Usage:
+    python benchmarks/bench_semantic.py --resumes 200
+    SEMANTIC_BACKEND=hashing python benchmarks/bench_semantic.py --resumes 200
+
+Measures, for the embedder semantic.get_embedder() picks:
+  * embedding throughput (sentences/s),
+  * batched similarity throughput (sentence pairs/s) for a few batch sizes,
+  * JD vectors read back from the memory-mapped store vs. re-embedded,
+  * end-to-end analyze_semantic() resumes/s for one JD.
+Vectors are written to a temporary directory, not instance/.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("SEMANTIC_VECTOR_DIR", tempfile.mkdtemp(prefix="bench_semantic_"))
+
+JD = """Senior Software Engineer (backend)
+- Design and build REST APIs in Python and Flask, deployed with Docker on Kubernetes.
+- Own CI/CD pipelines and production monitoring; debug incidents quickly.
+- Strong leadership: mentor junior engineers and lead design reviews.
+- Excellent written and verbal communication with product stakeholders.
+- Experience with PostgreSQL, Redis and message queues such as Kafka."""
+
+BULLETS = [
+    "Led a team of {n} engineers building Flask services in Python.",
+    "Mentored {n} interns through their first production releases.",
+    "Containerized {n} applications with Docker and wrote CI pipelines.",
+    "Presented quarterly results to stakeholders and wrote design docs.",
+    "Debugged production incidents and cut error rates by {n}%.",
+    "Migrated {n} MySQL tables to PostgreSQL with zero downtime.",
+    "Built dashboards for {n} product teams using SQL and Tableau.",
+    "Coordinated releases across {n} squads in an agile process.",
+    "Wrote unit and integration tests raising coverage to {n}%.",
+    "Automated reporting with pandas, saving {n} hours a week.",
+]
+
+
+def synthetic_resume(rng):
+    lines = [rng.choice(BULLETS).format(n=rng.randint(2, 40)) for _ in range(rng.randint(12, 24))]
+    return "Jane Doe\nSoftware Engineer\n" + "\n".join(f"• {line}" for line in lines)
+
+
+def rate(count, seconds):
+    return count / seconds if seconds else float("inf")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    import numpy as np
+
+    import semantic
+    from analyzer import analyze_semantic, extract_keywords
+
+    rng = random.Random(args.seed)
+    resumes = [synthetic_resume(rng) for _ in range(args.resumes)]
+    sentences = [s for text in resumes for s in semantic.split_sentences(text)]
+    embedder = semantic.get_embedder()
+    print(f"\n📊 backend {embedder.name}, {len(resumes)} resumes, {len(sentences)} sentences\n")
+
+    start = time.perf_counter()
+    vectors = embedder.encode(sentences)
+    elapsed = time.perf_counter() - start
+    print(f"embed             : {rate(len(sentences), elapsed):>12,.0f} sentences/s")
+
+    queries = vectors[: min(len(vectors), 2000)]
+    for batch_size in (64, 256, 1024):
+        start = time.perf_counter()
+        semantic.best_matches(queries, vectors, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"similarity b={batch_size:<5}: {rate(len(queries) * len(vectors), elapsed):>12,.0f} pairs/s")
+
+    jd_sentences = semantic.split_sentences(JD)
+    semantic.jd_sentence_vectors(jd_sentences, embedder)  # written to the store
+    timings = {"stored": [], "re-embedded": []}
+    for _ in range(50):
+        start = time.perf_counter()
+        stored = np.asarray(semantic.jd_sentence_vectors(jd_sentences, embedder))
+        timings["stored"].append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        embedder.encode(jd_sentences)
+        timings["re-embedded"].append((time.perf_counter() - start) * 1000)
+    for name, values in timings.items():
+        print(f"JD vectors {name:<12}: {statistics.median(values):>8.3f} ms (p50, {len(stored)} sentences)")
+
+    keywords = extract_keywords(JD.lower())
+    start = time.perf_counter()
+    for text in resumes:
+        analyze_semantic(text, JD.lower(), keywords=keywords)
+    elapsed = time.perf_counter() - start
+    print(f"analyze_semantic  : {rate(len(resumes), elapsed):>12,.1f} resumes/s "
+          f"({elapsed / len(resumes) * 1000:.1f} ms each)")
+
+
+if __name__ == "__main__":
+    main()
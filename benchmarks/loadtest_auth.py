@@ -0,0 +1,98 @@
+"""Concurrent signup/login/dashboard load test against a running SkillSync server.
+
+Usage:
+    gunicorn -w 4 app:app --bind 127.0.0.1:8000   # in another terminal
+    python benchmarks/loadtest_auth.py --url http://127.0.0.1:8000 --users 200 --concurrency 32
+
+Each virtual user signs up, logs in and loads /dashboard a few times with its
+own cookie session. The script reports throughput, latency percentiles and
+any failed requests (a 500 from "database is locked" shows up here).
+"""
+import argparse
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+PASSWORD = "LoadTest#2025"
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_user(base_url, dashboard_hits, run_id, n):
+    timings = defaultdict(list)
+    errors = []
+    session = requests.Session()
+    username = f"load_{run_id}_{n}"
+
+    def call(name, method, path, **kwargs):
+        start = time.perf_counter()
+        try:
+            resp = session.request(method, base_url + path, timeout=30, allow_redirects=False, **kwargs)
+            ok = resp.status_code < 400
+            detail = resp.status_code
+        except requests.RequestException as e:
+            ok, detail = False, str(e)
+        timings[name].append(time.perf_counter() - start)
+        if not ok:
+            errors.append((name, detail))
+
+    call("signup", "POST", "/signup", data={"username": username, "password": PASSWORD})
+    call("login", "POST", "/login", data={"username": username, "password": PASSWORD})
+    for _ in range(dashboard_hits):
+        call("dashboard", "GET", "/dashboard")
+    return timings, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--dashboard-hits", type=int, default=3)
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    timings = defaultdict(list)
+    errors = []
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [
+            pool.submit(run_user, args.url.rstrip("/"), args.dashboard_hits, run_id, n)
+            for n in range(args.users)
+        ]
+        for future in futures:
+            user_timings, user_errors = future.result()
+            for name, values in user_timings.items():
+                timings[name].extend(values)
+            errors.extend(user_errors)
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(v) for v in timings.values())
+    print(f"\n📊 {args.users} users, concurrency {args.concurrency}: "
+          f"{total} requests in {elapsed:.2f}s ({total / elapsed:.1f} req/s)\n")
+    print(f"{'endpoint':<10} {'count':>6} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name in ("signup", "login", "dashboard"):
+        values = [v * 1000 for v in timings[name]]
+        if not values:
+            continue
+        print(f"{name:<10} {len(values):>6} {statistics.mean(values):>9.1f} "
+              f"{percentile(values, 50):>8.1f} {percentile(values, 95):>8.1f} {percentile(values, 99):>8.1f}")
+
+    print(f"\n❌ {len(errors)} failed request(s)")
+    for name, detail in errors[:10]:
+        print(f"   {name}: {detail}")
+
+
+if __name__ == "__main__":
+    main()
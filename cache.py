@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+# ----------------------------
+# Size-bounded in-process LRU
+# ----------------------------
+class SizedLRU:
+    """Thread-safe LRU mapping bounded by the total size of its values.
+
+    `sizeof` measures one value (len() by default, which is bytes for bytes and
+    characters for str). The least recently used entries are dropped once the
+    running total exceeds `max_bytes`; a single value larger than the whole
+    budget is never stored. With `ttl` (seconds) entries also expire; with
+    `sliding` every read restarts that clock, so entries expire once idle.
+    """
+
+    def __init__(self, max_bytes, sizeof=len, ttl=None, sliding=False):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sliding = sliding
+        self._sizeof = sizeof
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+                del self._data[key]
+                self.current_bytes -= entry[1]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            if self.sliding and entry[2] is not None:
+                self._data[key] = (entry[0], entry[1], time.monotonic() + self.ttl)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            expires = time.monotonic() + self.ttl if self.ttl else None
+            self._data[key] = (value, size, expires)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._data.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def prune(self):
+        """Drop every expired entry now instead of waiting for it to be looked up."""
+        now = time.monotonic()
+        with self._lock:
+            for key in [k for k, (_, _, expires) in self._data.items() if expires is not None and expires <= now]:
+                self.current_bytes -= self._data.pop(key)[1]
+                self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._data),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
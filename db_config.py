@@ -0,0 +1,66 @@
+import os
+
+from sqlalchemy import event
+
+DEFAULT_DATABASE_URI = "sqlite:///site.db"
+
+
+# ----------------------------
+# Database URL
+# ----------------------------
+def database_uri():
+    """DATABASE_URL if set (e.g. Postgres on the host), otherwise the local SQLite file."""
+    uri = os.getenv("DATABASE_URL", DEFAULT_DATABASE_URI)
+    # Heroku-style URLs use the scheme SQLAlchemy dropped in 1.4
+    if uri.startswith("postgres://"):
+        uri = "postgresql://" + uri[len("postgres://"):]
+    return uri
+
+
+def is_sqlite(uri):
+    return uri.startswith("sqlite")
+
+
+# ----------------------------
+# Engine / pool settings
+# ----------------------------
+def engine_options(uri):
+    """SQLALCHEMY_ENGINE_OPTIONS for this database, tunable through DB_* environment variables."""
+    options = {"pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") == "1"}
+    if is_sqlite(uri):
+        options["connect_args"] = {
+            # Seconds a writer waits on the file lock before "database is locked"
+            "timeout": float(os.getenv("SQLITE_BUSY_TIMEOUT", "15")),
+            "check_same_thread": False,
+        }
+        if ":memory:" not in uri and uri not in ("sqlite://", "sqlite:///"):
+            options["pool_size"] = int(os.getenv("DB_POOL_SIZE", "5"))
+            options["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    else:
+        options.update({
+            "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+            "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+            "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        })
+    return options
+
+
+def install_sqlite_pragmas(engine):
+    """Switch SQLite to WAL + synchronous=NORMAL on every new connection.
+
+    WAL lets readers proceed while one writer commits, which is what stops the
+    "database is locked" errors when several gunicorn workers share site.db.
+    SQLITE_JOURNAL_MODE / SQLITE_SYNCHRONOUS override the defaults.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    journal_mode = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    synchronous = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={synchronous}")
+        cursor.close()
@@ -0,0 +1,160 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from cache import SizedLRU
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DB = os.getenv("EXTRACT_CACHE_DB", os.path.join(BASE_DIR, "instance", "extract_cache.db"))
+MEMORY_LIMIT = int(os.getenv("EXTRACT_CACHE_MEMORY_MB", "32")) * 1024 * 1024
+DISK_LIMIT = int(os.getenv("EXTRACT_CACHE_DISK_MB", "256")) * 1024 * 1024
+
+# Bump when extraction output changes so stale entries are not served.
+EXTRACTOR_VERSION = 2
+
+
+# ----------------------------
+# Content hashing
+# ----------------------------
+def content_digest(source, chunk_size=1024 * 1024):
+    """SHA-256 hex digest of a file path or a seekable binary stream.
+
+    Streams are read from their current position and rewound afterwards so the
+    caller can hand the same object straight to the extractor.
+    """
+    h = hashlib.sha256()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                h.update(chunk)
+    else:
+        start = source.tell()
+        for chunk in iter(lambda: source.read(chunk_size), b""):
+            h.update(chunk)
+        source.seek(start)
+    return h.hexdigest()
+
+
+# ----------------------------
+# Two-tier extraction cache
+# ----------------------------
+class ExtractionCache:
+    """Extracted text keyed by content hash: in-process LRU in front of a sqlite table."""
+
+    def __init__(self, db_path=CACHE_DB, memory_limit=MEMORY_LIMIT, disk_limit=DISK_LIMIT):
+        self.db_path = db_path
+        self.disk_limit = disk_limit
+        self.memory = SizedLRU(memory_limit, sizeof=lambda text: len(text.encode("utf-8")))
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_evictions = 0
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS extracted_text ("
+                        " key TEXT PRIMARY KEY,"
+                        " text TEXT NOT NULL,"
+                        " size INTEGER NOT NULL,"
+                        " last_access REAL NOT NULL)"
+                    )
+                    conn.execute(
+                        "CREATE INDEX IF NOT EXISTS ix_extracted_text_last_access"
+                        " ON extracted_text (last_access)"
+                    )
+                    conn.commit()
+                    self._ready = True
+        return conn
+
+    def get(self, key):
+        text = self.memory.get(key)
+        if text is not None:
+            return text
+
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT text FROM extracted_text WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE extracted_text SET last_access = ? WHERE key = ?", (time.time(), key)
+                    )
+                    conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print("⚠️  Extraction cache read failed:", e)
+            row = None
+
+        if row is None:
+            self.disk_misses += 1
+            return None
+        self.disk_hits += 1
+        self.memory.set(key, row[0])
+        return row[0]
+
+    def put(self, key, text):
+        self.memory.set(key, text)
+        size = len(text.encode("utf-8"))
+        if size > self.disk_limit:
+            return
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO extracted_text (key, text, size, last_access)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, text, size, time.time()),
+                )
+                self._evict(conn)
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print("⚠️  Extraction cache write failed:", e)
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM extracted_text").fetchone()[0]
+        if total <= self.disk_limit:
+            return
+        rows = conn.execute("SELECT key, size FROM extracted_text ORDER BY last_access").fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.disk_limit:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM extracted_text WHERE key = ?", stale)
+        self.disk_evictions += len(stale)
+
+    def stats(self):
+        return {
+            "memory": self.memory.stats(),
+            "disk": {
+                "hits": self.disk_hits,
+                "misses": self.disk_misses,
+                "evictions": self.disk_evictions,
+                "max_bytes": self.disk_limit,
+            },
+        }
+
+
+extraction_cache = ExtractionCache()
+
+
+def cached_extract(source, kind, extractor):
+    """Return extractor(source), served from the cache when these bytes were seen before."""
+    key = f"{kind}:v{EXTRACTOR_VERSION}:{content_digest(source)}"
+    text = extraction_cache.get(key)
+    if text is None:
+        text = extractor(source)
+        extraction_cache.put(key, text)
+    return text
@@ -1,24 +1,181 @@
+import os
+import re
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
 import pdfplumber
 import docx2txt
+from extract_cache import cached_extract
 
-# Function to extract text from PDF
-def extract_from_pdf(file_path):
-    text = ""
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() + "\n"
-    return text
+# Hard caps so a hostile or huge PDF cannot pin a worker
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "50"))
+MAX_PDF_CHARS = int(os.getenv("MAX_PDF_CHARS", "200000"))
+
+# Optional process-pool mode for long documents (0/1 = sequential)
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "0"))
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("PDF_PARALLEL_PAGES", "20"))
+
+# Uploads up to this size stay in memory; larger ones spill to a private temp file
+UPLOAD_SPOOL_LIMIT = int(os.getenv("UPLOAD_SPOOL_MB", "5")) * 1024 * 1024
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+_SPACE_RE = re.compile(r"\s+")
+
+# Function to extract text from PDF (path or binary stream)
+def extract_from_pdf(source):
+    return cached_extract(source, "pdf", _parse_pdf)
+
+# Function to extract text from DOCX (path or binary stream)
+def extract_from_docx(source):
+    return cached_extract(source, "docx", _parse_docx)
+
+def _parse_pdf(source):
+    with pdfplumber.open(source) as pdf:
+        page_count = min(len(pdf.pages), MAX_PDF_PAGES)
+        if PDF_WORKERS > 1 and page_count >= PARALLEL_PAGE_THRESHOLD:
+            pages = _iter_pages_parallel(source, page_count)
+        else:
+            pages = _iter_pages(pdf, 0, page_count)
+        return _join_pages(pages, MAX_PDF_CHARS)
 
-# Function to extract text from DOCX
-def extract_from_docx(file_path):
-    text = docx2txt.process(file_path)
+def _parse_docx(source):
+    text = docx2txt.process(source)
     return text
 
+
+# ----------------------------
+# Streaming / page-parallel PDF extraction
+# ----------------------------
+def iter_pdf_pages(source, max_pages=MAX_PDF_PAGES, max_chars=MAX_PDF_CHARS):
+    """Yield each page's text as soon as it is parsed, stopping at the page/character caps."""
+    remaining = max_chars
+    with pdfplumber.open(source) as pdf:
+        for text in _iter_pages(pdf, 0, min(len(pdf.pages), max_pages)):
+            if remaining <= 0:
+                return
+            text = text[:remaining]
+            remaining -= len(text)
+            yield text
+
+def _iter_pages(pdf, start, stop):
+    for page in pdf.pages[start:stop]:
+        # Scanned/image-only pages come back as None
+        yield page.extract_text() or ""
+        # Drop the parsed layout objects so long documents don't pile up in memory
+        page.flush_cache()
+
+def _extract_page_range(source, start, stop):
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    with pdfplumber.open(source) as pdf:
+        return list(_iter_pages(pdf, start, stop))
+
+def _iter_pages_parallel(source, page_count):
+    if not isinstance(source, (str, os.PathLike)):
+        # Streams can't cross the process boundary; ship the raw bytes instead
+        source.seek(0)
+        source = source.read()
+    chunk = -(-page_count // PDF_WORKERS)
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    futures = [_get_pool().submit(_extract_page_range, source, start, stop) for start, stop in ranges]
+    for future in futures:
+        yield from future.result()
+
+def _join_pages(pages, max_chars):
+    parts = []
+    remaining = max_chars
+    for text in pages:
+        if remaining <= 0:
+            break
+        text = text[:remaining]
+        remaining -= len(text)
+        parts.append(text)
+        parts.append("\n")
+    return "".join(parts)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+    return _pool
+
+
+# ----------------------------
+# Parsed document (extract once, reuse everywhere)
+# ----------------------------
+class ParsedDocument:
+    """Extracted text of an uploaded file plus the derived forms the analyzers need."""
+
+    def __init__(self, text, filename=None):
+        self.text = text or ""
+        self.filename = filename
+        self._normalized = None
+        self._tokens = None
+
+    @property
+    def normalized(self):
+        """Lowercased text with whitespace runs collapsed to single spaces."""
+        if self._normalized is None:
+            self._normalized = _SPACE_RE.sub(" ", self.text.lower()).strip()
+        return self._normalized
+
+    @property
+    def tokens(self):
+        """Word tokens of the normalized text (keeps "c++", "node.js", "c#")."""
+        if self._tokens is None:
+            self._tokens = _TOKEN_RE.findall(self.normalized)
+        return self._tokens
+
+    def __str__(self):
+        return self.text
+
+
+def _extractor_for(filename):
+    name = (filename or "").lower()
+    if name.endswith(".pdf"):
+        return extract_from_pdf
+    if name.endswith(".docx"):
+        return extract_from_docx
+    raise ValueError("Unsupported file format. Use .pdf or .docx")
+
+
+def parse_document(file_path):
+    """Extract a .pdf or .docx file once and wrap it in a ParsedDocument."""
+    text = _extractor_for(file_path)(file_path)
+    return ParsedDocument(text, filename=file_path)
+
+
+def parse_bytes(data, filename):
+    """Extract a .pdf/.docx held in memory (e.g. an upload handed to a background job)."""
+    extractor = _extractor_for(filename)
+    return ParsedDocument(extractor(BytesIO(data)), filename=filename)
+
+
+def parse_upload(file_storage):
+    """Extract an uploaded .pdf/.docx straight from the request stream (nothing written to uploads/)."""
+    extractor = _extractor_for(file_storage.filename)
+    stream = file_storage.stream
+    if not (hasattr(stream, "seekable") and stream.seekable()):
+        spooled = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_LIMIT)
+        shutil.copyfileobj(stream, spooled)
+        stream = spooled
+    stream.seek(0)
+    return ParsedDocument(extractor(stream), filename=file_storage.filename)
+
+
 # Test the functions
 if __name__ == "__main__":
     # Change these paths to your sample files
     pdf_resume = "sample_resume.pdf"
     docx_resume = "sample_resume.docx"
-    
+
     print("PDF Resume Text:\n", extract_from_pdf(pdf_resume))
     print("\nDOCX Resume Text:\n", extract_from_docx(docx_resume))
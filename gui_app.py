@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from extract_text import extract_from_pdf, extract_from_docx
+from extract_text import parse_document
 from analyzer import analyze_resume, load_job_description, save_to_csv
 
 def upload_resume():
@@ -29,16 +29,13 @@ def run_analysis():
         return
 
     # Extract resume text
-    if resume_file.endswith(".pdf"):
-        resume_text = extract_from_pdf(resume_file)
-    else:
-        resume_text = extract_from_docx(resume_file)
+    resume_doc = parse_document(resume_file)
 
     # Load JD
     jd_text = load_job_description(jd_file)
 
     # Analyze
-    results = analyze_resume(resume_text, jd_text)
+    results = analyze_resume(resume_doc, jd_text)
     save_to_csv(results)
 
     # Show results
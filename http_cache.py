@@ -0,0 +1,109 @@
+import gzip
+import hashlib
+import os
+from functools import wraps
+
+from flask import current_app, request, session
+
+from cache import SizedLRU
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "500"))
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+COMPRESSIBLE_TYPES = {
+    "text/html", "text/css", "text/plain", "text/javascript",
+    "application/javascript", "application/json", "image/svg+xml",
+}
+PAGE_CACHE_TTL = int(os.getenv("PAGE_CACHE_TTL", "60"))  # seconds
+PAGE_CACHE_MB = int(os.getenv("PAGE_CACHE_MB", "4"))
+
+
+def _compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=COMPRESS_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0)
+
+
+def negotiate_encoding():
+    """Best Content-Encoding this client accepts: br, then gzip, else None."""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+# ----------------------------
+# ETag + compression for every response
+# ----------------------------
+def finalize_response(response):
+    """after_request hook: strong ETag / 304 for GET pages, then gzip or brotli the body.
+
+    Streamed responses (SSE, NDJSON), files sent through send_file and
+    bodies that already carry a Content-Encoding pass through untouched.
+    """
+    if response.direct_passthrough or response.is_streamed or response.content_encoding:
+        return response
+    if response.status_code != 200 or response.mimetype not in COMPRESSIBLE_TYPES:
+        return response
+
+    body = response.get_data()
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate_encoding() if len(body) >= COMPRESS_MIN_BYTES else None
+
+    # The ETag names this representation, so each encoding gets its own
+    if request.method in ("GET", "HEAD") and not response.get_etag()[0]:
+        etag = hashlib.sha1(body).hexdigest()
+        response.set_etag(f"{etag}-{encoding}" if encoding else etag)
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+
+    if encoding:
+        response.set_data(_compress(body, encoding))
+        response.content_encoding = encoding
+    return response
+
+
+def init_app(app):
+    app.after_request(finalize_response)
+
+
+# ----------------------------
+# Short-TTL cache for anonymous pages
+# ----------------------------
+def cache_anonymous_page(ttl=PAGE_CACHE_TTL, max_bytes=PAGE_CACHE_MB * 1024 * 1024):
+    """Route decorator: serve the rendered page from memory for visitors with an empty session.
+
+    Logged-in users (or anyone with pending flash messages) always get a fresh
+    render. Entries are keyed on the full path including the query string.
+    """
+    def decorator(view):
+        pages = SizedLRU(max_bytes, sizeof=lambda entry: len(entry[0]), ttl=ttl)
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != "GET" or session:
+                return view(*args, **kwargs)
+            key = request.full_path
+            entry = pages.get(key)
+            if entry is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                entry = (response.get_data(), response.mimetype)
+                pages.set(key, entry)
+            body, mimetype = entry
+            response = current_app.response_class(body, mimetype=mimetype)
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+
+        wrapper.page_cache = pages
+        return wrapper
+    return decorator
@@ -0,0 +1,137 @@
+import threading
+from collections import defaultdict
+
+import numpy as np
+
+from extract_text import ParsedDocument
+from role_packs import role_packs
+
+JD_MATCH_LIMIT = 20
+
+
+# ----------------------------
+# In-memory inverted index over stored JDs
+# ----------------------------
+class JDLibrary:
+    """Inverted index (role, skill) -> (JD rows, TF-IDF weights) over the JD library.
+
+    Each stored JD carries the weighted skills extract_keywords() found in it
+    and the role pack it was read with. A resume is scored against every JD
+    at once: the postings of the skills it has are concatenated and summed
+    per JD with np.bincount, then divided by each JD's total weight, which
+    gives the same weighted coverage as overall_match() for that JD alone.
+    """
+
+    def __init__(self, jds):
+        """`jds`: iterable of dicts with id, title, company, role and skills ({category: {skill: weight}})."""
+        self.ids, self.titles, self.companies, self.roles, self.skills = [], [], [], [], []
+        postings = defaultdict(lambda: ([], []))
+        totals = []
+        for row, jd in enumerate(jds):
+            self.ids.append(jd["id"])
+            self.titles.append(jd.get("title"))
+            self.companies.append(jd.get("company"))
+            self.roles.append(jd["role"])
+            self.skills.append(jd["skills"])
+            total = 0.0
+            for weights in jd["skills"].values():
+                for skill, weight in weights.items():
+                    rows, values = postings[(jd["role"], skill)]
+                    rows.append(row)
+                    values.append(weight)
+                    total += weight
+            totals.append(total)
+        self.totals = np.array(totals, dtype=np.float32)
+        self.postings = {
+            key: (np.array(rows, dtype=np.int32), np.array(values, dtype=np.float32))
+            for key, (rows, values) in postings.items()
+        }
+        self.role_names = sorted(set(self.roles))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def resume_skills(self, resume_text):
+        """{role: canonical skills in the resume}, read once with each role pack the library uses."""
+        return {role: set(role_packs.get(role).trie.find(resume_text)) for role in self.role_names}
+
+    def scores(self, found):
+        """(N,) weighted share (0-1) of each JD's skills that the resume has."""
+        rows, weights = [], []
+        for role, skills in found.items():
+            for skill in skills:
+                posting = self.postings.get((role, skill))
+                if posting is not None:
+                    rows.append(posting[0])
+                    weights.append(posting[1])
+        if not rows:
+            return np.zeros(len(self), dtype=np.float32)
+        covered = np.bincount(np.concatenate(rows), weights=np.concatenate(weights), minlength=len(self))
+        return np.divide(covered, self.totals, out=np.zeros(len(self)), where=self.totals > 0)
+
+    def top(self, resume, limit=JD_MATCH_LIMIT):
+        """Best matching JDs for a resume (str or ParsedDocument), best first, with matched/missing skills."""
+        if not isinstance(resume, ParsedDocument):
+            resume = ParsedDocument(resume)
+        if not len(self):
+            return []
+        found = self.resume_skills(resume.normalized)
+        scores = self.scores(found)
+        k = min(limit, len(self))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.lexsort((best, -scores[best]))]
+
+        matches = []
+        for row in best.tolist():
+            have = found[self.roles[row]]
+            entry = {
+                "id": self.ids[row],
+                "title": self.titles[row],
+                "company": self.companies[row],
+                "role": self.roles[row],
+                "overall_match": round(float(scores[row]) * 100, 2),
+            }
+            for category, weights in self.skills[row].items():
+                entry[category] = {
+                    "matched": [skill for skill in weights if skill in have],
+                    "missing": [skill for skill in weights if skill not in have],
+                }
+            matches.append(entry)
+        return matches
+
+
+def keyword_skills(keywords):
+    """{category: {skill: weight}} of a KeywordSet, in its importance order, for storage."""
+    return {
+        category: {skill: round(keywords.weights[skill], 4) for skill in skills}
+        for category, skills in keywords.items()
+    }
+
+
+# ----------------------------
+# Rebuilt only when the table changes
+# ----------------------------
+class JDLibraryCache:
+    """Holds the JDLibrary for one table state and rebuilds it when the state stamp changes.
+
+    The stamp is anything cheap that changes with the table, e.g.
+    (row count, latest updated_at); `load` returns the rows to index.
+    """
+
+    def __init__(self):
+        self._stamp = None
+        self._library = None
+        self._lock = threading.Lock()
+
+    def get(self, stamp, load):
+        library = self._library
+        if library is not None and self._stamp == stamp:
+            return library
+        with self._lock:
+            if self._library is None or self._stamp != stamp:
+                self._library, self._stamp = JDLibrary(load()), stamp
+            return self._library
+
+    def clear(self):
+        with self._lock:
+            self._library, self._stamp = None, None
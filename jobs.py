@@ -0,0 +1,162 @@
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# Each process stamps its unfinished jobs this often...
+JOB_HEARTBEAT_SECONDS = int(os.getenv("JOB_HEARTBEAT_SECONDS", "15"))
+# ...and a job whose stamp is older than this is assumed to have died with its process
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "90"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+# ----------------------------
+# Local background job queue
+# ----------------------------
+class JobQueue:
+    """Runs registered handlers on a local thread pool and records them in a job table.
+
+    Handlers are plain functions that receive the keyword arguments given to
+    submit() and return a dict. A returned "file" (bytes) is stored alongside
+    "filename"/"mimetype"; everything else is stored as the JSON result. No
+    external broker is involved, so the queue works the same under tests.
+
+    Every job row records the process that owns it (`worker_id`) and a
+    heartbeat that process refreshes while the job is unfinished. Any worker
+    fails jobs whose heartbeat has gone stale, so a job whose process died is
+    reported as failed within JOB_STALE_SECONDS, while jobs that are still
+    alive in a sibling gunicorn worker are left alone.
+    """
+
+    def __init__(self, max_workers=JOB_WORKERS):
+        self.max_workers = max_workers
+        self.handlers = {}
+        self.app = None
+        self.db = None
+        self.model = None
+        self._executor = None
+        self._pending = {}
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def init_app(self, app, db, model):
+        self.app = app
+        self.db = db
+        self.model = model
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        with app.app_context():
+            self.reap()
+        threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True).start()
+
+    def heartbeat(self):
+        """Refresh the heartbeat of this process's unfinished jobs."""
+        self.model.query.filter(
+            self.model.worker_id == self.worker_id, self.model.status.in_([QUEUED, RUNNING])
+        ).update({"heartbeat_at": datetime.utcnow()}, synchronize_session=False)
+        self.db.session.commit()
+
+    def reap(self):
+        """Fail unfinished jobs whose owning process has stopped sending heartbeats."""
+        model = self.model
+        stale_before = datetime.utcnow() - timedelta(seconds=JOB_STALE_SECONDS)
+        # Rows from before heartbeats existed only have created_at to go by
+        last_seen = self.db.func.coalesce(model.heartbeat_at, model.created_at)
+        model.query.filter(model.status.in_([QUEUED, RUNNING]), last_seen < stale_before).update(
+            {"status": FAILED, "error": "Interrupted: the worker running this job stopped.",
+             "finished_at": datetime.utcnow()},
+            synchronize_session=False,
+        )
+        self.db.session.commit()
+
+    def _heartbeat_loop(self):
+        while True:
+            time.sleep(JOB_HEARTBEAT_SECONDS)
+            with self.app.app_context():
+                try:
+                    self.heartbeat()
+                    self.reap()
+                except Exception:
+                    traceback.print_exc()
+                    self.db.session.rollback()
+
+    def handler(self, kind):
+        """Decorator registering the function that runs jobs of this kind."""
+        def register(func):
+            self.handlers[kind] = func
+            return func
+        return register
+
+    def submit(self, kind, owner_id, **kwargs):
+        """Record a queued job owned by `owner_id`, hand it to the pool and return its id immediately.
+
+        All keyword arguments (including a `user_id`, if the handler wants one) go to the handler.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        self.db.session.add(self.model(
+            id=job_id, user_id=owner_id, kind=kind, status=QUEUED,
+            worker_id=self.worker_id, heartbeat_at=datetime.utcnow(),
+        ))
+        self.db.session.commit()
+        future = self._executor.submit(self._run, job_id, kind, kwargs)
+        self._pending[job_id] = future
+        future.add_done_callback(lambda _: self._pending.pop(job_id, None))
+        return job_id
+
+    def wait(self, job_id, timeout=None):
+        """Block until a job submitted by this process has finished (used by tests/scripts)."""
+        future = self._pending.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+
+    def _run(self, job_id, kind, kwargs):
+        with self.app.app_context():
+            session = self.db.session
+            try:
+                job = session.get(self.model, job_id)
+                job.status = RUNNING
+                job.started_at = job.heartbeat_at = datetime.utcnow()
+                session.commit()
+                result = dict(self.handlers[kind](**kwargs) or {})
+                job.result_file = result.pop("file", None)
+                job.result_filename = result.pop("filename", None)
+                job.result_mimetype = result.pop("mimetype", None)
+                job.result_json = json.dumps(result)
+                job.status = DONE
+                job.finished_at = datetime.utcnow()
+                session.commit()
+            except Exception as e:
+                traceback.print_exc()
+                # A failed flush/commit leaves the session unusable until it is rolled back;
+                # reload the job afterwards so FAILED is recorded on a clean row.
+                session.rollback()
+                job = session.get(self.model, job_id)
+                if job is None:
+                    return
+                job.status = FAILED
+                job.error = str(e)
+                job.finished_at = datetime.utcnow()
+                session.commit()
+
+
+def job_to_dict(job):
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "error": job.error,
+        "result": json.loads(job.result_json) if job.result_json else None,
+        "has_file": job.result_file is not None,
+    }
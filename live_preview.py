@@ -0,0 +1,126 @@
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from jinja2 import nodes
+
+PREVIEW_SESSION_TTL = int(os.getenv("PREVIEW_SESSION_TTL", str(2 * 60 * 60)))  # seconds
+
+
+# ----------------------------
+# Which template blocks read which fields
+# ----------------------------
+def _names(node):
+    return {n.name for n in node.find_all(nodes.Name) if n.ctx == "load"}
+
+
+def _names_outside_blocks(node):
+    for child in node.iter_child_nodes():
+        if isinstance(child, nodes.Block):
+            continue
+        if isinstance(child, nodes.Name) and child.ctx == "load":
+            yield child.name
+        yield from _names_outside_blocks(child)
+
+
+@lru_cache(maxsize=32)
+def block_dependencies(env, source):
+    """({block: variables it reads}, variables read outside every block) for a template source.
+
+    Worked out from the template's AST, so editing a template never needs a
+    hand-maintained field-to-block map. Cached on the source.
+    """
+    tree = env.parse(source)
+    blocks = {block.name: _names(block) for block in tree.find_all(nodes.Block)}
+    return blocks, set(_names_outside_blocks(tree))
+
+
+def affected_blocks(dependencies, changed):
+    """Blocks to re-render for these changed fields, or None when only a full render will do."""
+    blocks, outside = dependencies
+    changed = set(changed)
+    if changed & outside:
+        return None
+    return [name for name, names in blocks.items() if names & changed]
+
+
+def render_blocks(template, block_names, context):
+    """Render just the named blocks of a compiled template with this context."""
+    ctx = template.new_context(context)
+    return {name: "".join(template.blocks[name](ctx)) for name in block_names}
+
+
+# ----------------------------
+# Server-side payload per editor session
+# ----------------------------
+class PreviewSession:
+    __slots__ = ("template", "payload", "version")
+
+    def __init__(self, template, payload, version=1):
+        self.template = template
+        self.payload = payload
+        self.version = version
+
+
+class PreviewSessions:
+    """Last payload each live-preview client rendered, so later requests can send only changes.
+
+    Sessions are rows of a database table (see init_app), not process memory,
+    so any gunicorn worker can apply a client's changes. Applying changes is a
+    compare-and-set on the version: of two requests built on the same version
+    only one lands and the other client is told to resync. Sessions idle for
+    longer than the TTL are deleted; their clients also resync, sending their
+    full payload again.
+    """
+
+    def __init__(self, ttl=PREVIEW_SESSION_TTL):
+        self.ttl = ttl
+        self.db = None
+        self.model = None
+
+    def init_app(self, db, model):
+        self.db = db
+        self.model = model
+
+    def _expired_before(self):
+        return datetime.utcnow() - timedelta(seconds=self.ttl)
+
+    def expire(self):
+        """Delete sessions idle for longer than the TTL."""
+        self.model.query.filter(self.model.updated_at < self._expired_before()).delete(synchronize_session=False)
+        self.db.session.commit()
+
+    def start(self, template, payload):
+        self.expire()
+        session = PreviewSession(template, dict(payload))
+        session_id = uuid.uuid4().hex
+        self.db.session.add(self.model(id=session_id, template=template, payload=json.dumps(session.payload),
+                                       version=session.version, updated_at=datetime.utcnow()))
+        self.db.session.commit()
+        return session_id, session
+
+    def apply(self, session_id, version, changes):
+        """Merge changes into a session.
+
+        Returns (session, changed field names), or (None, None) when the
+        session is unknown or expired, or the client is not on the latest version.
+        """
+        row = self.db.session.get(self.model, session_id) if session_id else None
+        if row is None or row.version != version or row.updated_at < self._expired_before():
+            return None, None
+        payload = json.loads(row.payload)
+        changed = [field for field, value in changes.items() if payload.get(field) != value]
+        payload.update(changes)
+        template = payload.get("template", row.template)
+        # Another worker may have applied a change to the same version since the read
+        updated = self.model.query.filter_by(id=session_id, version=version).update(
+            {"template": template, "payload": json.dumps(payload), "version": version + 1,
+             "updated_at": datetime.utcnow()},
+            synchronize_session=False,
+        )
+        self.db.session.commit()
+        if not updated:
+            return None, None
+        return PreviewSession(template, payload, version + 1), changed
@@ -0,0 +1,159 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from cache import SizedLRU
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DB = os.getenv("LLM_CACHE_DB", os.path.join(BASE_DIR, "instance", "llm_cache.db"))
+CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory,sqlite")
+CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+MEMORY_LIMIT = int(os.getenv("LLM_CACHE_MEMORY_MB", "16")) * 1024 * 1024
+DISK_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt):
+    """Collapse whitespace so indentation differences in f-string prompts share a cache entry."""
+    return _SPACE_RE.sub(" ", prompt).strip()
+
+
+def cache_key(model_name, prompt):
+    raw = f"{model_name}\0{normalize_prompt(prompt)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ----------------------------
+# Backends (get/set by key)
+# ----------------------------
+class MemoryBackend(SizedLRU):
+    """In-process LRU with TTL, bounded by the size of the cached responses."""
+
+    def __init__(self, max_bytes=MEMORY_LIMIT, ttl=CACHE_TTL):
+        super().__init__(max_bytes, sizeof=lambda text: len(text.encode("utf-8")), ttl=ttl)
+
+
+class SQLiteBackend:
+    """Responses persisted in a sqlite table so they survive restarts and are shared by workers."""
+
+    def __init__(self, db_path=CACHE_DB, ttl=CACHE_TTL, max_entries=DISK_MAX_ENTRIES):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS llm_response ("
+                        " key TEXT PRIMARY KEY,"
+                        " response TEXT NOT NULL,"
+                        " expires_at REAL NOT NULL,"
+                        " last_access REAL NOT NULL)"
+                    )
+                    conn.execute(
+                        "CREATE INDEX IF NOT EXISTS ix_llm_response_last_access"
+                        " ON llm_response (last_access)"
+                    )
+                    conn.commit()
+                    self._ready = True
+        return conn
+
+    def get(self, key, default=None):
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT response FROM llm_response WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE llm_response SET last_access = ? WHERE key = ?", (now, key))
+                    conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print("⚠️  LLM cache read failed:", e)
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return row[0]
+
+    def set(self, key, value):
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_response (key, response, expires_at, last_access)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, value, now + self.ttl, now),
+                )
+                conn.execute("DELETE FROM llm_response WHERE expires_at <= ?", (now,))
+                conn.execute(
+                    "DELETE FROM llm_response WHERE key IN ("
+                    " SELECT key FROM llm_response ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print("⚠️  LLM cache write failed:", e)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "max_entries": self.max_entries}
+
+
+BACKENDS = {"memory": MemoryBackend, "sqlite": SQLiteBackend}
+
+
+# ----------------------------
+# Tiered response cache
+# ----------------------------
+class ResponseCache:
+    """Gemini responses keyed on model name + normalized prompt, checked backend by backend."""
+
+    def __init__(self, backends):
+        self.backends = list(backends)
+
+    @classmethod
+    def from_env(cls, spec=CACHE_BACKEND):
+        names = [name.strip() for name in spec.split(",") if name.strip()]
+        unknown = [name for name in names if name not in BACKENDS]
+        if unknown:
+            raise ValueError(f"Unknown LLM cache backend(s): {', '.join(unknown)}")
+        return cls(BACKENDS[name]() for name in names)
+
+    def get(self, model_name, prompt):
+        key = cache_key(model_name, prompt)
+        for i, backend in enumerate(self.backends):
+            text = backend.get(key)
+            if text is not None:
+                # Promote into the faster tiers in front of this one
+                for faster in self.backends[:i]:
+                    faster.set(key, text)
+                return text
+        return None
+
+    def set(self, model_name, prompt, text):
+        key = cache_key(model_name, prompt)
+        for backend in self.backends:
+            backend.set(key, text)
+
+    def stats(self):
+        return {type(b).__name__: b.stats() for b in self.backends}
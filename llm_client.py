@@ -0,0 +1,203 @@
+import asyncio
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+from llm_cache import ResponseCache
+
+MODEL_NAME = os.getenv("GEMINI_MODEL", "models/gemini-2.5-flash-preview-09-2025")
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+REQUEST_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+MAX_RETRIES = int(os.getenv("LLM_RETRIES", "2"))
+RETRY_BACKOFF = float(os.getenv("LLM_RETRY_BACKOFF", "0.5"))
+
+# Transient failures worth another attempt; anything else is raised immediately
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+# Text of a generation and whether it was served from the response cache
+LLMResponse = namedtuple("LLMResponse", ["text", "cached"])
+
+
+class LLMError(RuntimeError):
+    """Base error for Gemini calls made through LLMClient."""
+
+
+class LLMBusy(LLMError):
+    """All concurrency slots stayed taken for the whole timeout."""
+
+
+class LLMTimeout(LLMError):
+    """The call (including retries) did not finish within its timeout."""
+
+
+# ----------------------------
+# Shared Gemini client
+# ----------------------------
+class LLMClient:
+    """One configured Gemini model shared by every route.
+
+    Calls run on a small thread pool guarded by a semaphore, so at most
+    `max_concurrency` requests are in flight and a slow Gemini response costs
+    the calling request at most `timeout` seconds instead of a whole worker.
+    Callers that pass cache=True share responses through `response_cache`.
+    """
+
+    def __init__(self, api_key, model_name=MODEL_NAME, max_concurrency=MAX_CONCURRENCY,
+                 timeout=REQUEST_TIMEOUT, retries=MAX_RETRIES, backoff=RETRY_BACKOFF,
+                 response_cache=None):
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.response_cache = response_cache
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="gemini")
+
+    def submit(self, prompt, timeout=None):
+        """Queue a generation and return a Future resolving to the response text."""
+        timeout = self.timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise LLMBusy("Too many AI requests in progress. Please try again shortly.")
+        try:
+            return self._executor.submit(self._run, prompt, time.monotonic() + timeout)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def generate(self, prompt, timeout=None, cache=False):
+        """Blocking generation with timeout and retries; returns an LLMResponse."""
+        use_cache = cache and self.response_cache is not None
+        if use_cache:
+            text = self.response_cache.get(self.model_name, prompt)
+            if text is not None:
+                return LLMResponse(text, True)
+
+        timeout = self.timeout if timeout is None else timeout
+        future = self.submit(prompt, timeout)
+        try:
+            text = future.result(timeout=timeout)
+        except FutureTimeout:
+            raise LLMTimeout(f"AI request timed out after {timeout:.0f}s")
+
+        if use_cache:
+            self.response_cache.set(self.model_name, prompt, text)
+        return LLMResponse(text, False)
+
+    def stream(self, prompt, timeout=None):
+        """Yield response text chunks as Gemini produces them.
+
+        Runs in the caller's thread but still holds a concurrency slot until the
+        generator finishes or is closed. Retries only happen before the first
+        chunk has been yielded.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise LLMBusy("Too many AI requests in progress. Please try again shortly.")
+        try:
+            deadline = time.monotonic() + timeout
+            attempt = 0
+            while True:
+                try:
+                    response = self.model.generate_content(
+                        prompt, stream=True,
+                        request_options={"timeout": max(deadline - time.monotonic(), 1)},
+                    )
+                    chunks = iter(response)
+                    first = next(chunks, None)
+                    break
+                except RETRYABLE_ERRORS as e:
+                    attempt += 1
+                    delay = self.backoff * (2 ** (attempt - 1))
+                    if attempt > self.retries or time.monotonic() + delay >= deadline:
+                        raise
+                    print(f"⚠️  Gemini stream failed ({e}); retrying in {delay:.1f}s")
+                    time.sleep(delay)
+
+            # The first chunk decides whether there is an answer at all; later
+            # chunks without text (e.g. a trailing finish-reason chunk) are skipped
+            yield response_text(first)
+            for chunk in chunks:
+                try:
+                    yield response_text(chunk)
+                except LLMError:
+                    continue
+        finally:
+            self._slots.release()
+
+    async def agenerate(self, prompt, timeout=None):
+        """asyncio flavour of generate() for async views and scripts."""
+        timeout = self.timeout if timeout is None else timeout
+        future = await asyncio.to_thread(self.submit, prompt, timeout)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            raise LLMTimeout(f"AI request timed out after {timeout:.0f}s")
+
+    def _run(self, prompt, deadline):
+        try:
+            attempt = 0
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LLMTimeout("AI request timed out")
+                try:
+                    response = self.model.generate_content(
+                        prompt, request_options={"timeout": remaining}
+                    )
+                    return response_text(response)
+                except RETRYABLE_ERRORS as e:
+                    attempt += 1
+                    delay = self.backoff * (2 ** (attempt - 1))
+                    if attempt > self.retries or time.monotonic() + delay >= deadline:
+                        raise
+                    print(f"⚠️  Gemini call failed ({e}); retrying in {delay:.1f}s")
+                    time.sleep(delay)
+        finally:
+            self._slots.release()
+
+
+def response_text(response):
+    """Text of a Gemini response; raises LLMError for blocked/empty candidates.
+
+    Raising (rather than returning the response's repr) also keeps such
+    responses out of the response cache.
+    """
+    try:
+        text = response.text
+    except (AttributeError, ValueError):
+        text = None
+    if not text:
+        raise LLMError("The AI returned no answer (the response may have been blocked). Please rephrase and try again.")
+    return text
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide LLMClient, or None when GEMINI_API_KEY is not set."""
+    global _client
+    if _client is None:
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            return None
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient(api_key, response_cache=ResponseCache.from_env())
+    return _client
@@ -0,0 +1,148 @@
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PDF_RENDERER = os.getenv("PDF_RENDERER", "auto")  # auto | weasyprint | wkhtmltopdf
+RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+RENDER_TIMEOUT = float(os.getenv("PDF_RENDER_TIMEOUT", "60"))
+
+# Page setup shared by both backends (what the wkhtmltopdf options used to say)
+PAGE_SIZE = "Letter"
+PAGE_MARGIN = "0.5in"
+
+# Where wkhtmltopdf usually lives when it is not on PATH
+WKHTMLTOPDF_CANDIDATES = [
+    r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe",
+    r"C:\Program Files (x86)\wkhtmltopdf\bin\wkhtmltopdf.exe",
+    "/usr/local/bin/wkhtmltopdf",
+    "/usr/bin/wkhtmltopdf",
+    "/opt/homebrew/bin/wkhtmltopdf",
+    "/app/bin/wkhtmltopdf",
+]
+
+
+class RendererUnavailable(RuntimeError):
+    """No usable PDF backend was found on this host."""
+
+
+# ----------------------------
+# Backends
+# ----------------------------
+class WeasyPrintBackend:
+    """In-process renderer: no subprocess per download, fonts/CSS machinery stays warm."""
+
+    name = "weasyprint"
+
+    def __init__(self):
+        import weasyprint  # raises ImportError/OSError when the library or pango is missing
+        self._weasyprint = weasyprint
+        self._page_css = weasyprint.CSS(string=f"@page {{ size: {PAGE_SIZE}; margin: {PAGE_MARGIN}; }}")
+        # Render once so font discovery and CSS parsing costs are paid at startup
+        self.render("<p>warm-up</p>")
+
+    def render(self, html):
+        document = self._weasyprint.HTML(string=html, base_url=BASE_DIR)
+        return document.write_pdf(stylesheets=[self._page_css])
+
+
+class WkhtmltopdfBackend:
+    """wkhtmltopdf through pdfkit; one process per render, so it is the fallback."""
+
+    name = "wkhtmltopdf"
+
+    def __init__(self):
+        import pdfkit
+        binary = find_wkhtmltopdf()
+        if not binary:
+            raise RendererUnavailable("wkhtmltopdf binary not found (set WKHTMLTOPDF_PATH)")
+        self._pdfkit = pdfkit
+        self.binary = binary
+        self._config = pdfkit.configuration(wkhtmltopdf=binary)
+        self._options = {
+            'page-size': PAGE_SIZE,
+            'margin-top': PAGE_MARGIN,
+            'margin-right': PAGE_MARGIN,
+            'margin-bottom': PAGE_MARGIN,
+            'margin-left': PAGE_MARGIN,
+            'encoding': "UTF-8",
+            'no-outline': None,
+            'enable-local-file-access': None,
+            'print-media-type': None,  # Use print media queries (preserves colors)
+            'disable-smart-shrinking': None,
+            'quiet': None,
+        }
+
+    def render(self, html):
+        return self._pdfkit.from_string(html, False, configuration=self._config, options=self._options)
+
+
+def find_wkhtmltopdf():
+    """WKHTMLTOPDF_PATH, then PATH, then the usual install locations."""
+    configured = os.getenv("WKHTMLTOPDF_PATH")
+    if configured:
+        return configured if os.path.isfile(configured) else None
+    found = shutil.which("wkhtmltopdf")
+    if found:
+        return found
+    for candidate in WKHTMLTOPDF_CANDIDATES:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+BACKENDS = {"weasyprint": WeasyPrintBackend, "wkhtmltopdf": WkhtmltopdfBackend}
+
+
+def load_backend(preference=PDF_RENDERER):
+    """Instantiate the preferred backend; 'auto' tries WeasyPrint first, then wkhtmltopdf."""
+    names = list(BACKENDS) if preference == "auto" else [preference]
+    errors = []
+    for name in names:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown PDF renderer: {name}")
+        try:
+            return BACKENDS[name]()
+        except Exception as e:
+            errors.append(f"{name}: {e}")
+    raise RendererUnavailable("No PDF renderer available (" + "; ".join(errors) + ")")
+
+
+# ----------------------------
+# Bounded renderer pool
+# ----------------------------
+class PDFRenderer:
+    """Runs a warm backend on a fixed number of threads so bursts of downloads queue instead of piling up."""
+
+    def __init__(self, backend, workers=RENDER_WORKERS, timeout=RENDER_TIMEOUT):
+        self.backend = backend
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf")
+
+    @property
+    def name(self):
+        return self.backend.name
+
+    def render(self, html, timeout=None):
+        future = self._executor.submit(self.backend.render, html)
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except FutureTimeout:
+            raise TimeoutError("PDF rendering timed out")
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_renderer():
+    """Process-wide PDFRenderer, created (and warmed up) on first use."""
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = PDFRenderer(load_backend())
+                print(f"✅ PDF renderer: {_renderer.name}")
+    return _renderer
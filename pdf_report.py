@@ -1,3 +1,6 @@
+import os
+from io import BytesIO
+
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.platypus import (
@@ -6,40 +9,99 @@ from reportlab.platypus import (
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from analyzer import build_resume_suggestions
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOGO_PATH = os.path.join(BASE_DIR, "static", "logo.png")
+LOGO_SIZE = 80  # points on the page
+LOGO_PIXELS = 240  # 3x the printed size keeps it sharp without embedding the 1024px original
+
+# ----------------------------
+# Shared styles (built once, reused by every report)
+# ----------------------------
+STYLES = getSampleStyleSheet()
+
+# Custom paragraph style for wrapping inside tables
+WRAP_STYLE = ParagraphStyle(
+    "wrap_style",
+    parent=STYLES["Normal"],
+    fontSize=10,
+    leading=14,
+)
+
+SUMMARY_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#5B86E5")),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+    ("FONTSIZE", (0, 0), (-1, 0), 12),
+    ("BOTTOMPADDING", (0, 0), (-1, 0), 10),
+])
+
+
+def _skills_table_style(label_color):
+    return TableStyle([
+        ("BACKGROUND", (0, 0), (0, -1), label_color),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("LEFTPADDING", (0, 0), (-1, -1), 6),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+    ])
+
+
+TECH_TABLE_STYLE = _skills_table_style(colors.lightblue)
+SOFT_TABLE_STYLE = _skills_table_style(colors.lightgreen)
+
+
+def _load_logo(path=LOGO_PATH, pixels=LOGO_PIXELS):
+    """Downscaled JPEG bytes of the logo, or None if it cannot be read.
+
+    ReportLab embeds JPEG data as-is, so each report carries a few KB instead
+    of re-compressing the full-size PNG.
+    """
+    try:
+        from PIL import Image as PILImage
+        with PILImage.open(path) as im:
+            im = im.convert("RGB")
+            im.thumbnail((pixels, pixels), PILImage.LANCZOS)
+            buf = BytesIO()
+            im.save(buf, format="JPEG", quality=85, optimize=True)
+            return buf.getvalue()
+    except Exception as e:
+        print(f"⚠️  Report logo unavailable: {e}")
+        return None
+
+
+LOGO_BYTES = _load_logo()
+
 
 def generate_pdf_report(
     filename,
     technical_match,
     technical_matched,
     technical_missing,
-    output_path,
+    output_path=None,
     soft_match=None,
     soft_matched=None,
     soft_missing=None
 ):
-    """Generate a professional-looking PDF resume analysis report with wrapped tables and suggestions."""
+    """Generate a professional-looking PDF resume analysis report with wrapped tables and suggestions.
+
+    `output_path` may be a file path or a binary file object; without one the
+    report is built in memory and its bytes are returned.
+    """
 
     soft_matched = soft_matched or []
     soft_missing = soft_missing or []
 
-    doc = SimpleDocTemplate(output_path, pagesize=A4, rightMargin=40, leftMargin=40, topMargin=40)
-    styles = getSampleStyleSheet()
+    target = output_path if output_path is not None else BytesIO()
+    doc = SimpleDocTemplate(target, pagesize=A4, rightMargin=40, leftMargin=40, topMargin=40)
+    styles = STYLES
+    wrap_style = WRAP_STYLE
     elements = []
 
-    # Custom paragraph style for wrapping inside tables
-    wrap_style = ParagraphStyle(
-        "wrap_style",
-        parent=styles["Normal"],
-        fontSize=10,
-        leading=14,
-    )
-
     # ----- Logo and Title -----
-    try:
-        logo_path = "static/logo.png"
-        elements.append(Image(logo_path, width=80, height=80))
-    except Exception:
-        pass
+    if LOGO_BYTES:
+        elements.append(Image(BytesIO(LOGO_BYTES), width=LOGO_SIZE, height=LOGO_SIZE))
 
     title = f"<b>SkillSync – AI Resume Analyzer</b>"
     elements.append(Paragraph(title, styles["Title"]))
@@ -56,15 +118,7 @@ def generate_pdf_report(
         ["Soft Skills", f"{soft_match if soft_match else 0}%"]
     ]
     summary_table = Table(summary_data, colWidths=[200, 200])
-    summary_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#5B86E5")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ("FONTSIZE", (0, 0), (-1, 0), 12),
-        ("BOTTOMPADDING", (0, 0), (-1, 0), 10),
-    ]))
+    summary_table.setStyle(SUMMARY_TABLE_STYLE)
     elements.append(summary_table)
     elements.append(Spacer(1, 20))
 
@@ -81,13 +135,7 @@ def generate_pdf_report(
         ]
     ]
     tech_table = Table(tech_data, colWidths=[150, 350])
-    tech_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (0, -1), colors.lightblue),
-        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ("LEFTPADDING", (0, 0), (-1, -1), 6),
-        ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-    ]))
+    tech_table.setStyle(TECH_TABLE_STYLE)
     elements.append(tech_table)
     elements.append(Spacer(1, 20))
 
@@ -104,13 +152,7 @@ def generate_pdf_report(
         ]
     ]
     soft_table = Table(soft_data, colWidths=[150, 350])
-    soft_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (0, -1), colors.lightgreen),
-        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ("LEFTPADDING", (0, 0), (-1, -1), 6),
-        ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-    ]))
+    soft_table.setStyle(SOFT_TABLE_STYLE)
     elements.append(soft_table)
     elements.append(Spacer(1, 25))
 
@@ -143,4 +185,7 @@ def generate_pdf_report(
     elements.append(footer)
 
     doc.build(elements)
-    print(f"✅ PDF report generated: {output_path}")
+    if output_path is None:
+        return target.getvalue()
+    if isinstance(output_path, str):
+        print(f"✅ PDF report generated: {output_path}")
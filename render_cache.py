@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import threading
+
+from cache import SizedLRU
+
+RENDER_CACHE_HTML_MB = int(os.getenv("RENDER_CACHE_HTML_MB", "16"))
+RENDER_CACHE_PDF_MB = int(os.getenv("RENDER_CACHE_PDF_MB", "64"))
+
+
+def _sha256(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def payload_digest(template, context):
+    """Stable digest of a template name plus the values it is rendered with."""
+    body = json.dumps(context, sort_keys=True, ensure_ascii=False, default=str)
+    return _sha256(f"{template}\n{body}")
+
+
+def html_digest(html):
+    """Digest of rendered HTML; doubles as the /preview ETag."""
+    return _sha256(html)
+
+
+# ----------------------------
+# Two-level rendered-resume cache
+# ----------------------------
+class RenderCache:
+    """payload digest -> (HTML, HTML digest) and HTML digest -> PDF bytes.
+
+    Both levels are memory-bounded LRUs. The PDF level is keyed on the HTML
+    rather than the payload, so payloads that render to identical markup
+    (e.g. whitespace-only edits the template drops) share one PDF.
+    """
+
+    def __init__(self, html_bytes=RENDER_CACHE_HTML_MB * 1024 * 1024, pdf_bytes=RENDER_CACHE_PDF_MB * 1024 * 1024):
+        self.html = SizedLRU(html_bytes, sizeof=lambda entry: len(entry[0]))
+        self.pdf = SizedLRU(pdf_bytes)
+        # One render per key at a time; concurrent identical clicks wait for the first
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, key):
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _release(self, key):
+        with self._locks_guard:
+            self._locks.pop(key, None)
+
+    def get_html(self, template, context, render):
+        """Return (html, etag), calling render(template, context) only on a miss."""
+        key = payload_digest(template, context)
+        entry = self.html.get(key)
+        if entry is None:
+            try:
+                with self._lock_for(key):
+                    entry = self.html.get(key)
+                    if entry is None:
+                        html = render(template, context)
+                        entry = (html, html_digest(html))
+                        self.html.set(key, entry)
+            finally:
+                # A failed render must not leave its lock behind in _locks
+                self._release(key)
+        return entry
+
+    def get_pdf(self, html, render, digest=None):
+        """Return PDF bytes for this HTML, calling render(html) only on a miss."""
+        key = digest or html_digest(html)
+        pdf = self.pdf.get(key)
+        if pdf is None:
+            try:
+                with self._lock_for(key):
+                    pdf = self.pdf.get(key)
+                    if pdf is None:
+                        pdf = render(html)
+                        self.pdf.set(key, pdf)
+            finally:
+                self._release(key)
+        return pdf
+
+    def clear(self):
+        self.html.clear()
+        self.pdf.clear()
+
+    def stats(self):
+        return {"html": self.html.stats(), "pdf": self.pdf.stats()}
+
+
+render_cache = RenderCache()
@@ -0,0 +1,212 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+from cache import SizedLRU
+from skill_taxonomy import SkillTrie, compile_taxonomy, get_skill_trie, tokenize
+from skill_vocabulary import SkillVocabulary, get_vocabulary
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROLE_PACK_DIR = os.getenv("ROLE_PACK_DIR", os.path.join(BASE_DIR, "data", "roles"))
+INDEX_NAME = "index.json"
+ROLE_PACK_CACHE = int(os.getenv("ROLE_PACK_CACHE", "8"))  # compiled packs kept in memory
+ROLE_PACK_IDLE_SECONDS = int(os.getenv("ROLE_PACK_IDLE_SECONDS", "900"))
+ROLE_PACK_JD_CACHE = int(os.getenv("ROLE_PACK_JD_CACHE", "128"))  # extracted JDs memoized per pack
+# Weighted signal score a JD needs before it is read with a role pack
+ROLE_MIN_SCORE = float(os.getenv("ROLE_MIN_SCORE", "3"))
+
+# Reads the JD with the whole vocabulary and the global taxonomy
+GENERAL_ROLE = "general"
+
+
+class UnknownRole(ValueError):
+    """The requested role has no pack in data/roles/index.json."""
+
+
+# ----------------------------
+# Compiled role pack
+# ----------------------------
+class RolePack:
+    """One role's skills (a slice of the vocabulary plus its own) and the trie they are matched with.
+
+    The pack ranks and weights its own skills, but it is not a whitelist:
+    `general` holds the vocabulary skills outside the pack, which are still
+    reported when the JD names them verbatim (e.g. "Leadership" in a SWE JD).
+    Extracted keywords are memoized per JD inside the pack, so they are
+    dropped together with it when the pack LRU evicts it.
+    """
+
+    def __init__(self, role, label, vocabulary, trie, general=None):
+        self.role = role
+        self.label = label
+        self.vocabulary = vocabulary
+        self.trie = trie
+        self.general = general or {}  # {skill: (tokens, category, idf)}
+        self._keywords = SizedLRU(ROLE_PACK_JD_CACHE, sizeof=lambda keywords: 1)
+
+    def general_skills(self, jd_text):
+        """{skill: (category, weight)} of general skills the JD spells out by name, not via an alias."""
+        found = {}
+        if not self.general:
+            return found
+        for skill, starts in self.trie.find(jd_text).items():
+            entry = self.general.get(skill)
+            if entry is None:
+                continue
+            tokens, category, idf = entry
+            count = sum(1 for start in starts
+                        if tuple(token for token, _ in tokenize(jd_text[start:start + len(skill)])) == tokens)
+            if count:
+                found[skill] = (category, float((1 + np.log(count)) * idf))
+        return found
+
+    def jd_keywords(self, jd_text):
+        keywords = self._keywords.get(jd_text)
+        if keywords is None:
+            keywords = self.vocabulary.jd_keywords(jd_text, self.trie, role=self.role,
+                                                   extra=self.general_skills(jd_text))
+            self._keywords.set(jd_text, keywords)
+        return keywords
+
+
+def compile_pack(role, label, data, vocabulary, base_trie):
+    """RolePack from a data/roles/<role>.json document.
+
+    Listed skills keep their vocabulary category and IDF; `extra_skills`
+    rows add role-only skills in the vocabulary's format. The pack's
+    aliases are layered over the global taxonomy and win on conflicts.
+    The rest of the vocabulary is compiled into the trie as well, so a
+    general skill the JD names verbatim is matched in JDs and resumes alike.
+    """
+    defaults = {name for names in data.get("defaults", {}).values() for name in names}
+    skills = []
+    for name in data.get("skills", []):
+        if name not in vocabulary.index:
+            raise ValueError(f"Role pack '{role}' lists unknown skill '{name}'")
+        skills.append(vocabulary.skills[vocabulary.index[name]])
+    skills += data.get("extra_skills", [])
+    skills = [dict(skill, default=skill["name"].lower() in defaults) for skill in skills]
+
+    pack_vocabulary = SkillVocabulary(skills, version=data.get("version", 1))
+    others = [name for name in vocabulary.names if name not in pack_vocabulary.index]
+    trie = compile_taxonomy(base_trie.taxonomy, names=pack_vocabulary.names + others, overrides=data.get("aliases"))
+    general = {}
+    for name in others:
+        # Skip names a pack alias claims for one of its own skills ("automation" in QA)
+        if trie.lookup(name) == name:
+            i = vocabulary.index[name]
+            general[name] = (tuple(token for token, _ in tokenize(name)), str(vocabulary.categories[i]),
+                             float(vocabulary.idf[i]))
+    return RolePack(role, label, pack_vocabulary, trie, general)
+
+
+# ----------------------------
+# JD role classifier
+# ----------------------------
+class RoleClassifier:
+    """Scores a JD against every role's weighted signal phrases in one trie scan.
+
+    A role's score is the sum of weight x (1 + log count) over the signal
+    phrases the JD contains.
+    """
+
+    def __init__(self, signals):
+        self.roles = list(signals)
+        phrases = sorted({phrase.lower() for role_signals in signals.values() for phrase in role_signals})
+        self.index = {phrase: i for i, phrase in enumerate(phrases)}
+        self.trie = SkillTrie({phrase: phrase for phrase in phrases})
+        self.weights = np.zeros((len(self.roles), len(phrases)), dtype=np.float32)
+        for r, role in enumerate(self.roles):
+            for phrase, weight in signals[role].items():
+                self.weights[r, self.index[phrase.lower()]] = weight
+
+    def scores(self, text):
+        """{role: score} for normalized JD text."""
+        tf = np.zeros(len(self.index), dtype=np.float32)
+        for phrase, count in self.trie.counts(text).items():
+            tf[self.index[phrase]] = 1 + np.log(count)
+        return dict(zip(self.roles, (self.weights @ tf).tolist()))
+
+    def classify(self, text, min_score=ROLE_MIN_SCORE):
+        """Best-scoring role, or None when no role reaches min_score."""
+        scores = self.scores(text)
+        role = max(scores, key=scores.get, default=None)
+        return role if role is not None and scores[role] >= min_score else None
+
+
+# ----------------------------
+# Lazily loaded packs with LRU + idle eviction
+# ----------------------------
+class RolePacks:
+    """Role index, classifier and compiled packs.
+
+    Only data/roles/index.json (labels + classifier signals) is read up front.
+    A pack file is compiled the first time a JD needs it and kept in an LRU
+    of at most `max_packs` packs; packs unused for `idle_seconds` are dropped.
+    Packs are keyed on the global taxonomy too, so a taxonomy reload
+    recompiles them on next use.
+    """
+
+    def __init__(self, directory=ROLE_PACK_DIR, max_packs=ROLE_PACK_CACHE, idle_seconds=ROLE_PACK_IDLE_SECONDS):
+        self.directory = directory
+        self._packs = SizedLRU(max_packs, sizeof=lambda pack: 1, ttl=idle_seconds, sliding=True)
+        self._index = None
+        self._classifier = None
+        self._general = None
+        self._lock = threading.Lock()
+
+    def _load_index(self):
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    with open(os.path.join(self.directory, INDEX_NAME), encoding="utf-8") as f:
+                        roles = json.load(f)["roles"]
+                    self._classifier = RoleClassifier({role: entry["signals"] for role, entry in roles.items()})
+                    self._index = roles
+        return self._index
+
+    @property
+    def labels(self):
+        return {role: entry["label"] for role, entry in self._load_index().items()}
+
+    def resolve(self, role):
+        """Registered role name for user input; raises UnknownRole."""
+        role = (role or "").strip().lower()
+        if role != GENERAL_ROLE and role not in self._load_index():
+            choices = ", ".join([GENERAL_ROLE, *sorted(self._index)])
+            raise UnknownRole(f"Unknown role '{role}'. Choose one of: {choices}")
+        return role
+
+    def detect(self, jd_text):
+        """Role pack to read this normalized JD with, or GENERAL_ROLE when none fits."""
+        self._load_index()
+        return self._classifier.classify(jd_text) or GENERAL_ROLE
+
+    def get(self, role):
+        role = self.resolve(role)
+        base = get_skill_trie()
+        if role == GENERAL_ROLE:
+            return self._general_pack(base)
+        key = (role, base.digest)
+        pack = self._packs.get(key)
+        if pack is None:
+            self._packs.prune()
+            with open(os.path.join(self.directory, f"{role}.json"), encoding="utf-8") as f:
+                data = json.load(f)
+            pack = compile_pack(role, self._index[role]["label"], data, get_vocabulary(), base)
+            self._packs.set(key, pack)
+        return pack
+
+    def _general_pack(self, base):
+        pack = self._general
+        if pack is None or pack.trie is not base:
+            pack = self._general = RolePack(GENERAL_ROLE, "General", get_vocabulary(), base)
+        return pack
+
+    def stats(self):
+        return self._packs.stats()
+
+
+role_packs = RolePacks()
@@ -0,0 +1,464 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from skill_taxonomy import get_skill_trie
+
+try:
+    import fcntl
+except ImportError:  # no cross-process locking (Windows); one worker only
+    fcntl = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# "auto" tries sentence-transformers and falls back to hashed n-grams
+SEMANTIC_BACKEND = os.getenv("SEMANTIC_BACKEND", "auto")
+SEMANTIC_MODEL = os.getenv("SEMANTIC_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+SEMANTIC_HASH_DIM = int(os.getenv("SEMANTIC_HASH_DIM", "2048"))
+SEMANTIC_BATCH = int(os.getenv("SEMANTIC_BATCH", "256"))  # rows per similarity matrix block
+SEMANTIC_VECTOR_DIR = os.getenv("SEMANTIC_VECTOR_DIR", os.path.join(BASE_DIR, "instance"))
+SEMANTIC_VECTOR_MAX_JDS = int(os.getenv("SEMANTIC_VECTOR_MAX_JDS", "5000"))  # JDs kept per embedder
+SENTENCE_MAX_WORDS = 40
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\s*\n\s*|\s*[•●▪■◦]\s*|\s+[-–]\s+|;\s+")
+_WORD_RE = re.compile(r"[^\W_]+[+#]*")
+_SUFFIXES = ("ations", "ation", "ings", "ing", "ments", "ment", "ships", "ship", "ers", "er", "ed", "es", "s", "ion", "ly")
+_STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our that the this to was were will with "
+    "we you your i my me".split()
+)
+# Past tenses suffix stripping can't reach ("led" should share a stem with "leader")
+_IRREGULAR = {
+    "led": "lead", "built": "build", "ran": "run", "wrote": "write", "written": "write", "taught": "teach",
+    "spoke": "speak", "spoken": "speak", "sold": "sell", "bought": "buy", "made": "make", "grew": "grow",
+    "grown": "grow", "drove": "drive", "driven": "drive", "began": "begin", "begun": "begin", "won": "win",
+    "brought": "bring", "thought": "think", "chose": "choose", "chosen": "choose",
+}
+
+
+def stem(word):
+    """Crude suffix stripping so word forms share a feature ("debugged"/"debugging" -> "debugg")."""
+    if word in _IRREGULAR:
+        return _IRREGULAR[word]
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+                word, stripped = word[:-len(suffix)], True
+                break
+    return word
+
+
+def content_stems(text):
+    """Stems of the words in `text` that aren't stop words."""
+    return {stem(w) for w in _WORD_RE.findall(text.lower()) if w not in _STOP_WORDS}
+
+
+def split_sentences(text):
+    """Resume/JD text -> list of sentence-sized chunks (bullets and lines count as sentences).
+
+    Chunks longer than SENTENCE_MAX_WORDS are cut into windows of that many
+    words; fragments of fewer than two words are dropped.
+    """
+    sentences = []
+    for part in _SENTENCE_RE.split(text or ""):
+        words = part.split()
+        for start in range(0, len(words), SENTENCE_MAX_WORDS):
+            chunk = words[start:start + SENTENCE_MAX_WORDS]
+            if len(chunk) >= 2:
+                sentences.append(" ".join(chunk))
+    return sentences
+
+
+# ----------------------------
+# Embedding backends
+# ----------------------------
+class HashingEmbedder:
+    """Dependency-free sentence vectors: signed feature hashing of word stems, word
+    bigrams and character 3-5 grams, L2-normalized.
+
+    Stems carry most of the weight so word forms line up ("presented" /
+    "presentation"); character n-grams add partial credit for the rest
+    ("teams"/"teamwork"). crc32 keeps the buckets identical across processes,
+    so stored vectors stay valid.
+    """
+
+    threshold = 0.48  # cosine a skill needs against a resume window to count as evidence
+    # A window must also share this many content stems with a spelling (all of them for
+    # shorter spellings): one shared "team" scores 0.67 against "team leader" on its own
+    shared_stems = 2
+    # Skills are compared with every 3-word window, so long sentences don't dilute the overlap
+    window = 3
+
+    def __init__(self, dim=SEMANTIC_HASH_DIM):
+        self.dim = dim
+        self.name = f"hashing2-{dim}"  # bump when features change; stored vectors are keyed by it
+
+    @lru_cache(maxsize=65536)
+    def _features(self, term):
+        if " " in term:  # word bigram
+            grams, weights = [term], [1.0]
+        else:
+            padded = f"<{term}>"
+            grams = [padded[i:i + n] for n in (3, 4, 5) for i in range(len(padded) - n + 1)]
+            # The n-grams of a word together weigh about as much as its stem
+            weights = [2.0] + [1.0 / np.sqrt(len(grams))] * len(grams)
+            grams = ["~" + stem(term)] + grams
+        buckets = [zlib.crc32(gram.encode("utf-8")) for gram in grams]
+        signs = [w if b & 0x80000000 else -w for b, w in zip(buckets, weights)]
+        return np.array([b % self.dim for b in buckets], dtype=np.int64), np.array(signs, dtype=np.float32)
+
+    def encode(self, sentences):
+        matrix = np.zeros((len(sentences), self.dim), dtype=np.float32)
+        rows, columns, signs = [], [], []
+        for row, sentence in enumerate(sentences):
+            words = [w for w in _WORD_RE.findall(sentence.lower()) if w not in _STOP_WORDS]
+            for term in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                term_columns, term_signs = self._features(term)
+                rows.append(np.full(len(term_columns), row))
+                columns.append(term_columns)
+                signs.append(term_signs)
+        if rows:
+            np.add.at(matrix, (np.concatenate(rows), np.concatenate(columns)), np.concatenate(signs))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+
+class SentenceTransformerEmbedder:
+    """A small sentence-transformers model on the CPU (optional dependency)."""
+
+    threshold = 0.45
+    window = None  # whole sentences: the model reads context
+    shared_stems = None
+
+    def __init__(self, model_name=SEMANTIC_MODEL):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = re.sub(r"[^a-z0-9]+", "-", model_name.lower()).strip("-")
+
+    def encode(self, sentences):
+        if not sentences:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return self.model.encode(list(sentences), batch_size=SEMANTIC_BATCH, convert_to_numpy=True,
+                                 normalize_embeddings=True, show_progress_bar=False).astype(np.float32)
+
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder():
+    """Process-wide embedder picked by SEMANTIC_BACKEND (auto | sentence-transformers | hashing)."""
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                if SEMANTIC_BACKEND in ("auto", "sentence-transformers"):
+                    try:
+                        _embedder = SentenceTransformerEmbedder()
+                    except Exception as e:  # not installed, or the model cannot be loaded
+                        if SEMANTIC_BACKEND != "auto":
+                            raise
+                        print(f"⚠️  sentence-transformers unavailable ({e}); using hashed n-gram vectors.")
+                if _embedder is None:
+                    _embedder = HashingEmbedder()
+    return _embedder
+
+
+# ----------------------------
+# Memory-mapped JD vector store
+# ----------------------------
+class VectorStore:
+    """Bounded on-disk store of JD sentence vectors, read through np.memmap.
+
+    Per embedder (so vectors from different models never mix) there is a
+    float32 data file that only grows by appends and an append-only index
+    log, instance/jd_vectors-<name>.idx: a header line naming the current
+    data file, then one [key, row, count] line per stored JD. A put appends
+    one line instead of rewriting the index, and readers pick up keys
+    written by other workers by reading the log from where they stopped.
+
+    Once `max_entries` JDs are stored, the next put compacts: the most
+    recently used three quarters (as this worker saw them) are copied to a
+    new data file and a fresh log replaces the old one. Writers serialize on
+    an exclusive lock on jd_vectors-<name>.lock.
+    """
+
+    def __init__(self, name, dim, directory=SEMANTIC_VECTOR_DIR, max_entries=SEMANTIC_VECTOR_MAX_JDS):
+        self.name = name
+        self.dim = dim
+        self.directory = directory
+        self.max_entries = max_entries
+        self.index_path = os.path.join(directory, f"jd_vectors-{name}.idx")
+        self.lock_path = os.path.join(directory, f"jd_vectors-{name}.lock")
+        self.path = None  # current data file, named by the log header
+        self._index = OrderedDict()  # key -> (row, count), least recently used first
+        self._log_id = None  # (st_dev, st_ino) of the log that was read
+        self._offset = 0
+        self._map = None
+        self._lock = threading.Lock()
+        self._sync_index()
+
+    def _sync_index(self):
+        """Read index lines appended since the last call; start over if the log was replaced."""
+        try:
+            with open(self.index_path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                if (stat.st_dev, stat.st_ino) != self._log_id:
+                    self._index, self._offset, self._map = OrderedDict(), 0, None
+                    self._log_id = (stat.st_dev, stat.st_ino)
+                if stat.st_size <= self._offset:
+                    return
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return
+        # Only whole lines: a writer may be halfway through the last one
+        data = data[:data.rfind(b"\n") + 1]
+        for line in data.splitlines():
+            entry = json.loads(line)
+            if isinstance(entry, dict):
+                self.path = os.path.join(self.directory, entry["data"])
+            else:
+                key, row, count = entry
+                self._index[key] = (row, count)
+        self._offset += len(data)
+
+    def _matrix(self, rows_needed):
+        if self._map is None or self._map.shape[0] < rows_needed:
+            rows = os.path.getsize(self.path) // (4 * self.dim)
+            self._map = np.memmap(self.path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return self._map
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, key):
+        """(count, dim) read-only view of the stored vectors, or None."""
+        with self._lock:
+            for _ in range(2):
+                entry = self._index.get(key)
+                if entry is None:
+                    self._sync_index()
+                    entry = self._index.get(key)
+                if entry is None:
+                    return None
+                self._index.move_to_end(key)
+                row, count = entry
+                if not count:
+                    return np.zeros((0, self.dim), dtype=np.float32)
+                try:
+                    return self._matrix(row + count)[row:row + count]
+                except (OSError, ValueError):
+                    # Another worker compacted the store since this log was read; start over
+                    self._log_id = None
+                    self._sync_index()
+            return None
+
+    def put(self, key, vectors):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.lock_path, "ab") as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    self._sync_index()
+                    if key in self._index:
+                        return
+                    if self.path is None or len(self._index) >= self.max_entries:
+                        self._compact(keep=self.max_entries * 3 // 4)
+                    with open(self.path, "ab") as f:
+                        row = f.seek(0, os.SEEK_END) // (4 * self.dim)
+                        f.write(vectors.tobytes())
+                    with open(self.index_path, "ab") as f:
+                        f.write(json.dumps([key, row, len(vectors)]).encode("utf-8") + b"\n")
+                        self._offset = f.tell()
+                    self._index[key] = (row, len(vectors))
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _compact(self, keep):
+        """Rewrite the store with its `keep` most recently used JDs (caller holds the file lock)."""
+        kept = list(self._index.items())[-keep:] if keep else []
+        data_name = f"jd_vectors-{self.name}-{uuid.uuid4().hex[:8]}.f32"
+        data_path = os.path.join(self.directory, data_name)
+        lines, row = [json.dumps({"data": data_name, "dim": self.dim})], 0
+        with open(data_path, "wb") as out:
+            for key, (old_row, count) in kept:
+                if count:
+                    out.write(np.ascontiguousarray(self._matrix(old_row + count)[old_row:old_row + count]).tobytes())
+                lines.append(json.dumps([key, row, count]))
+                row += count
+        tmp = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as out:
+            out.write("\n".join(lines) + "\n")
+        os.replace(tmp, self.index_path)
+        old_path, self._log_id = self.path, None
+        self._sync_index()
+        if old_path is not None and old_path != self.path:
+            # Workers that still map the old file keep reading it until they notice the new log
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+
+_stores = {}
+
+
+def get_vector_store(embedder):
+    store = _stores.get(embedder.name)
+    if store is None:
+        store = _stores.setdefault(embedder.name, VectorStore(embedder.name, embedder.dim))
+    return store
+
+
+def jd_sentence_vectors(jd_sentences, embedder):
+    """Embeddings of a JD's sentences, from the vector store when this JD was seen before."""
+    store = get_vector_store(embedder)
+    key = hashlib.sha1("\n".join(jd_sentences).encode("utf-8")).hexdigest()
+    vectors = store.get(key)
+    if vectors is None:
+        vectors = embedder.encode(jd_sentences)
+        store.put(key, vectors)
+    return vectors
+
+
+# ----------------------------
+# Batched similarity
+# ----------------------------
+def best_matches(queries, candidates, batch_size=SEMANTIC_BATCH, allowed=None):
+    """For each query row, (index, cosine) of its most similar candidate row.
+
+    Both inputs are L2-normalized; the (queries x candidates) similarity
+    matrix is computed batch_size query rows at a time to bound memory.
+    `allowed`, a (queries x candidates) bool matrix, scores the pairs it
+    leaves out as 0.
+    """
+    best = np.zeros(len(queries), dtype=np.int64)
+    scores = np.zeros(len(queries), dtype=np.float32)
+    if not len(queries) or not len(candidates):
+        return best, scores
+    for start in range(0, len(queries), batch_size):
+        sims = queries[start:start + batch_size] @ candidates.T
+        if allowed is not None:
+            sims = np.where(allowed[start:start + batch_size], sims, 0)
+        best[start:start + batch_size] = sims.argmax(axis=1)
+        scores[start:start + batch_size] = sims.max(axis=1)
+    return best, scores
+
+
+def sentence_windows(sentences, size):
+    """(texts, sentence index of each): the sentences themselves, or every `size`-word window of them."""
+    if not size:
+        return sentences, list(range(len(sentences)))
+    texts, owners = [], []
+    for i, sentence in enumerate(sentences):
+        words = sentence.split()
+        for start in range(max(1, len(words) - size + 1)):
+            texts.append(" ".join(words[start:start + size]))
+            owners.append(i)
+    return texts, owners
+
+
+def skill_forms(skill, trie):
+    """Spellings a skill is embedded as: its name plus its taxonomy aliases."""
+    aliases = (getattr(trie, "taxonomy", None) or {}).get("aliases", {}).get(skill, [])
+    return [skill, *aliases]
+
+
+def shared_stem_mask(forms, windows, required):
+    """(forms x windows) bool: the window shares `required` content stems with the
+    form, or all of them when the form has fewer."""
+    postings = {}
+    for i, window in enumerate(windows):
+        for word in content_stems(window):
+            postings.setdefault(word, []).append(i)
+    mask = np.zeros((len(forms), len(windows)), dtype=bool)
+    for row, form in enumerate(forms):
+        stems = content_stems(form)
+        counts = np.zeros(len(windows), dtype=np.int32)
+        for word in stems:
+            counts[postings.get(word, [])] += 1
+        mask[row] = counts >= min(required, len(stems))
+    return mask
+
+
+# ----------------------------
+# Semantic report
+# ----------------------------
+def semantic_report(resume_text, jd_text, keywords, results, embedder=None):
+    """Paraphrase-aware view of one analysis, alongside analyze_resume()'s `results`.
+
+    Each JD skill's spellings are embedded and compared with every resume
+    sentence (or short window, per the embedder). A skill missing from
+    `results` counts as matched when its best spelling against its best
+    window reaches the embedder's threshold (and, for the hashing embedder,
+    shares enough content stems with it). Every matched skill gets its
+    evidence sentence: the first one containing it verbatim, or the closest
+    one. jd_coverage is the mean best similarity of the JD's
+    sentences to the resume's, as a percentage.
+    """
+    embedder = embedder or get_embedder()
+    trie = getattr(keywords, "trie", None) or get_skill_trie()
+    sentences = split_sentences(resume_text)
+    resume_vectors = embedder.encode(sentences)
+    jd_sentences = split_sentences(jd_text)
+    _, jd_best = best_matches(jd_sentence_vectors(jd_sentences, embedder), resume_vectors)
+
+    # Sentence holding each verbatim hit, for skills analyze_resume already matched
+    verbatim = {}
+    for i, sentence in enumerate(sentences):
+        for skill in trie.find(sentence.lower()):
+            verbatim.setdefault(skill, i)
+
+    windows, owners = sentence_windows(sentences, embedder.window)
+    window_vectors = resume_vectors if windows is sentences else embedder.encode(windows)
+    skills = [skill for words in keywords.values() for skill in words]
+    forms = [skill_forms(skill, trie) for skill in skills]
+    flat = [form for spellings in forms for form in spellings]
+    allowed = shared_stem_mask(flat, windows, embedder.shared_stems) if embedder.shared_stems else None
+    best, scores = best_matches(embedder.encode(flat), window_vectors, allowed=allowed)
+    closest, start = {}, 0
+    for skill, spellings in zip(skills, forms):
+        top = start + int(np.argmax(scores[start:start + len(spellings)]))
+        closest[skill] = (owners[best[top]] if windows else 0, float(scores[top]))
+        start += len(spellings)
+
+    report = {
+        "backend": embedder.name,
+        "jd_coverage": round(float(np.clip(jd_best, 0, 1).mean()) * 100, 2) if len(jd_best) else 0,
+    }
+    for category, words in keywords.items():
+        exact = set(results[category]["matched"])
+        semantic = [w for w in words if w not in exact and sentences and closest[w][1] >= embedder.threshold]
+        evidence = {}
+        for skill in words:
+            if skill in exact and skill in verbatim:
+                evidence[skill] = {"sentence": sentences[verbatim[skill]], "score": 1.0, "verbatim": True}
+            elif skill in exact or skill in semantic:
+                i, score = closest[skill]
+                evidence[skill] = {"sentence": sentences[i] if sentences else None,
+                                   "score": round(score, 3), "verbatim": False}
+
+        weights = keywords.vectors[category] if hasattr(keywords, "vectors") else np.ones(len(words), dtype=np.float32)
+        hit = np.fromiter((w in exact or w in semantic for w in words), dtype=bool, count=len(words))
+        total = float(weights.sum())
+        report[category] = {
+            "matched": semantic,
+            "match_percent": round(float(weights[hit].sum()) / total * 100, 2) if total else 0,
+            "evidence": evidence,
+        }
+    return report
@@ -0,0 +1,60 @@
+import re
+from collections import OrderedDict
+from functools import lru_cache
+
+# Characters that count as part of a skill token. A keyword only matches
+# when it is not glued to one of these on either side, so "c" does not fire
+# inside "cloud" and "git" does not fire inside "digital". A dot followed by
+# a word character ("node.js") also counts as glue.
+_TOKEN_CHARS = r"\w+#"
+
+
+# ----------------------------
+# Compiled keyword matcher
+# ----------------------------
+class SkillMatcher:
+    """One-pass, word-boundary-aware matcher for a fixed list of keywords."""
+
+    def __init__(self, keywords):
+        # Preserve the caller's order (it drives the order of "matched"/"missing")
+        # while dropping duplicates.
+        self.keywords = list(OrderedDict.fromkeys(kw.lower() for kw in keywords))
+
+        # Longest alternatives first so "c++" wins over "c" and
+        # "spring boot" wins over "spring" at the same position.
+        alternatives = sorted(self.keywords, key=len, reverse=True)
+        pattern = "|".join(re.escape(kw) for kw in alternatives)
+        self._regex = re.compile(
+            rf"(?<![{_TOKEN_CHARS}])(?<!\w\.)(?:{pattern})(?![{_TOKEN_CHARS}]|\.\w)",
+            re.IGNORECASE,
+        ) if alternatives else None
+
+    def find(self, text):
+        """Return {keyword: [start offsets]} for every keyword found in text."""
+        positions = {}
+        if self._regex is None or not text:
+            return positions
+        for m in self._regex.finditer(text):
+            positions.setdefault(m.group(0).lower(), []).append(m.start())
+        return positions
+
+    def counts(self, text):
+        """Return {keyword: occurrences} for every keyword found in text."""
+        return {kw: len(pos) for kw, pos in self.find(text).items()}
+
+    def split(self, text):
+        """Return (matched, missing) keyword lists in the matcher's keyword order."""
+        found = self.find(text)
+        matched = [kw for kw in self.keywords if kw in found]
+        missing = [kw for kw in self.keywords if kw not in found]
+        return matched, missing
+
+
+@lru_cache(maxsize=64)
+def _compile(keywords):
+    return SkillMatcher(keywords)
+
+
+def get_matcher(keywords):
+    """Return a cached SkillMatcher for this keyword list (compiled once per process)."""
+    return _compile(tuple(keywords))
@@ -0,0 +1,265 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from skill_vocabulary import get_vocabulary
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH", os.path.join(BASE_DIR, "data", "skill_taxonomy.json"))
+# How often (seconds) a request may stat the taxonomy file to pick up edits
+TAXONOMY_CHECK_SECONDS = float(os.getenv("TAXONOMY_CHECK_SECONDS", "30"))
+
+# A token is a run of letters/digits with any trailing "+"/"#" ("c++", "c#").
+# A dot only belongs to a token at the start of a word (".net"); inside a
+# word it separates tokens, so "node.js", "node-js" and "node js" all read
+# as ["node", "js"] and one trie path covers every spelling.
+_TOKEN_RE = re.compile(r"(?:(?<![^\W_])\.)?[^\W_]+[+#]*")
+_END = "\0"
+_AMBIGUOUS = "\1"
+# Characters that glue a one-letter token into a larger word: "R&D", "C-suite", "R's"
+_LETTER_JOINERS = frozenset("&-'")
+# What may sit between the tokens of one multi-word form: spaces, one hyphen/slash,
+# or a dot with nothing after it ("node.js", but not "the node. JS developers")
+_JOIN_RE = re.compile(r"\s*[-/]?\s*|\.")
+# Gaps that end a sentence (or bullet) for the context check of ambiguous forms
+_BREAK_RE = re.compile(r"[!?;•]|\.\s")
+# An ambiguous form counts when an unambiguous skill is at most this many tokens away
+CONTEXT_TOKENS = 8
+
+
+def tokenize(text):
+    """[(token, start offset)] of lowercase text."""
+    return [(m.group(0), m.start()) for m in _TOKEN_RE.finditer(text.lower())]
+
+
+def _key(form):
+    return " ".join(token for token, _ in tokenize(form))
+
+
+# ----------------------------
+# Token trie: every surface form -> canonical skill
+# ----------------------------
+class SkillTrie:
+    """Matches every skill name and alias in one left-to-right scan over the tokens.
+
+    At each position the longest surface form wins ("spring boot" over
+    "spring", "regression testing" over "regression"), matches never overlap,
+    and every hit is reported under its canonical name. A multi-word form
+    never spans sentence punctuation or commas. A one-letter skill ("c", "r")
+    only matches as a standalone token, not inside "R&D" or "C-suite".
+
+    `ambiguous` spellings are also ordinary words ("swift", "rust", "vue",
+    "ai"). The text is lowercase, so case can't tell them apart; they count
+    only next to one of `context_words` ("swift developer") or with another
+    skill within CONTEXT_TOKENS tokens of the same sentence ("Swift and
+    Kotlin"), so "swift delivery" or "the AI team" don't.
+    """
+
+    def __init__(self, forms, version=1, digest="", ambiguous=(), context_words=()):
+        self.version = version
+        self.digest = digest
+        self.canonical = frozenset(forms.values())
+        self.context_words = frozenset(word.lower() for word in context_words)
+        ambiguous = {_key(form) for form in ambiguous}
+        self._root = {}
+        for form, canonical in forms.items():
+            node = self._root
+            for token, _ in tokenize(form):
+                node = node.setdefault(token, {})
+            node[_END] = canonical
+            if _key(form) in ambiguous:
+                node[_AMBIGUOUS] = True
+
+    def lookup(self, form):
+        """Canonical skill for this exact spelling, or None (no context rules applied)."""
+        node = self._root
+        for token, _ in tokenize(form):
+            node = node.get(token)
+            if node is None:
+                return None
+        return node.get(_END)
+
+    def find(self, text):
+        """Return {canonical skill: [start offsets]} for every skill found in text."""
+        tokens = tokenize(text) if text else []
+        n = len(tokens)
+        gaps = [text[start + len(token):tokens[k + 1][1]] for k, (token, start) in enumerate(tokens[:-1])]
+        matches = []  # (canonical, first token, end token, ambiguous)
+        root, i = self._root, 0
+        while i < n:
+            node, j, match = root, i, None
+            while j < n:
+                if j > i and not _JOIN_RE.fullmatch(gaps[j - 1]):
+                    break
+                node = node.get(tokens[j][0])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    match = (node[_END], i, j, _AMBIGUOUS in node)
+            if match is None or (match[2] == i + 1 and not self._standalone(text, tokens[i])):
+                i += 1
+                continue
+            matches.append(match)
+            i = match[2]
+        if any(match[3] for match in matches):
+            matches = self._in_context(matches, tokens, gaps)
+        positions = {}
+        for canonical, first, _, _ in matches:
+            positions.setdefault(canonical, []).append(tokens[first][1])
+        return positions
+
+    def _in_context(self, matches, tokens, gaps):
+        """Drop ambiguous matches with no context word beside them and no other skill near them."""
+        sentence = [0]
+        for gap in gaps:
+            sentence.append(sentence[-1] + bool(_BREAK_RE.search(gap)))
+        anchors = [(first, end) for _, first, end, ambiguous in matches if not ambiguous]
+        kept = []
+        for match in matches:
+            _, first, end, ambiguous = match
+            if ambiguous and not (
+                (first > 0 and sentence[first - 1] == sentence[first] and tokens[first - 1][0] in self.context_words)
+                or (end < len(tokens) and sentence[end] == sentence[end - 1] and tokens[end][0] in self.context_words)
+                or any(sentence[a] == sentence[first] and a - end < CONTEXT_TOKENS and first - b < CONTEXT_TOKENS
+                       for a, b in anchors)
+            ):
+                continue
+            kept.append(match)
+        return kept
+
+    @staticmethod
+    def _standalone(text, token):
+        """False for a one-letter token joined to its neighbours by _LETTER_JOINERS."""
+        word, start = token
+        if len(word) > 1:
+            return True
+        end = start + 1
+        return not ((start and text[start - 1] in _LETTER_JOINERS)
+                    or (end < len(text) and text[end] in _LETTER_JOINERS))
+
+    def counts(self, text):
+        """Return {canonical skill: occurrences} for every skill found in text."""
+        return {skill: len(pos) for skill, pos in self.find(text).items()}
+
+
+def _surface_forms(aliases, names=()):
+    """{tokenized spelling: canonical} for `names` (matched as themselves) and an alias map.
+
+    Raises ValueError when two canonical skills claim the same spelling.
+    """
+    forms = {}
+
+    def add(form, canonical):
+        key = _key(form)
+        if not key:
+            raise ValueError(f"Empty skill spelling for '{canonical}'")
+        if forms.setdefault(key, canonical) != canonical:
+            raise ValueError(f"'{form}' maps to both '{forms[key]}' and '{canonical}'")
+
+    for name in names:
+        add(name, name.lower())
+    for canonical, spellings in aliases.items():
+        canonical = canonical.lower()
+        add(canonical, canonical)
+        for alias in spellings:
+            add(alias, canonical)
+    return forms
+
+
+def compile_taxonomy(data, names=(), overrides=None):
+    """SkillTrie over `names` plus the taxonomy's aliases.
+
+    `overrides` is a second {canonical: [aliases]} map (a role pack's) whose
+    spellings win over the taxonomy's, e.g. "automation" -> "test automation".
+    """
+    forms = _surface_forms(data.get("aliases", {}), names)
+    digest = json.dumps(data, sort_keys=True)
+    if overrides:
+        forms.update(_surface_forms(overrides))
+        digest += json.dumps(overrides, sort_keys=True)
+    trie = SkillTrie(forms, version=data.get("version", 1),
+                     digest=hashlib.sha256(digest.encode("utf-8")).hexdigest()[:16],
+                     ambiguous=data.get("ambiguous", ()), context_words=data.get("context_words", ()))
+    trie.taxonomy = data
+    return trie
+
+
+# ----------------------------
+# Hot-reloadable current taxonomy
+# ----------------------------
+class TaxonomyStore:
+    """Holds the compiled trie for the taxonomy file and swaps in edits without blocking.
+
+    Readers just take `get()`'s reference and keep using it for the whole
+    request. A reload compiles the new trie off to the side and publishes it
+    with a single assignment, so in-flight requests finish on the old trie and
+    nobody waits. A file that fails to load leaves the current trie in place.
+    """
+
+    def __init__(self, path=SKILL_TAXONOMY_PATH, names=None, check_seconds=TAXONOMY_CHECK_SECONDS):
+        self.path = path
+        self.names = names  # callable returning the vocabulary's skill names
+        self.check_seconds = check_seconds
+        self._trie = None
+        self._mtime = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._reloading = False
+
+    def _build(self):
+        mtime = os.path.getmtime(self.path)
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        return compile_taxonomy(data, self.names() if self.names else ()), mtime
+
+    def reload(self):
+        """Compile the taxonomy file now and publish it; returns the new trie."""
+        trie, mtime = self._build()
+        self._trie, self._mtime = trie, mtime
+        return trie
+
+    def get(self):
+        trie = self._trie
+        if trie is None:
+            with self._lock:
+                if self._trie is None:
+                    self.reload()
+                    self._checked = time.monotonic()
+            return self._trie
+        if time.monotonic() - self._checked >= self.check_seconds:
+            self._checked = time.monotonic()
+            self._maybe_reload()
+        return trie
+
+    def _maybe_reload(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        with self._lock:
+            if mtime == self._mtime or self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload_in_background, args=(mtime,), daemon=True).start()
+
+    def _reload_in_background(self, mtime):
+        try:
+            trie = self.reload()
+            print(f"✅ Skill taxonomy v{trie.version} reloaded ({trie.digest})")
+        except (OSError, ValueError) as e:
+            self._mtime = mtime  # don't retry until the file changes again
+            print(f"⚠️  Keeping the current skill taxonomy; reload failed: {e}")
+        finally:
+            self._reloading = False
+
+
+taxonomy = TaxonomyStore(names=lambda: get_vocabulary().names)
+
+
+def get_skill_trie():
+    """Current compiled SkillTrie (vocabulary names + aliases); hold on to it for the whole request."""
+    return taxonomy.get()
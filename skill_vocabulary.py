@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SKILL_VOCAB_PATH = os.getenv("SKILL_VOCAB_PATH", os.path.join(BASE_DIR, "data", "skill_vocabulary.json"))
+
+CATEGORIES = ("technical", "soft")
+
+
+# ----------------------------
+# JD keywords with importance weights
+# ----------------------------
+class KeywordSet(dict):
+    """{category: [skills, most important first]} as returned by extract_keywords().
+
+    `weights` maps each skill to its TF-IDF weight in the JD; `vectors` holds
+    the same weights per category as float32 arrays aligned with the lists,
+    so a resume is scored with one masked sum per category. `trie` is the
+    SkillTrie the JD was read with (resumes are matched with the same one)
+    and `role` the role pack it came from, if any.
+    """
+
+    def __init__(self, categories, weights, trie=None, role=None):
+        super().__init__(categories)
+        self.weights = weights
+        self.trie = trie
+        self.role = role
+        self.vectors = {
+            category: np.array([weights[skill] for skill in skills], dtype=np.float32)
+            for category, skills in categories.items()
+        }
+
+
+# ----------------------------
+# Skill vocabulary + IDF table
+# ----------------------------
+class SkillVocabulary:
+    """Every known skill with its category and IDF.
+
+    Text is matched with a SkillTrie from skill_taxonomy, so aliases
+    ("k8s", "postgres") count towards their canonical skill.
+    """
+
+    def __init__(self, skills, version=1):
+        self.version = version
+        self.skills = skills
+        self.names = [skill["name"].lower() for skill in skills]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.categories = np.array([skill["category"] for skill in skills])
+        self.idf = np.array([skill["idf"] for skill in skills], dtype=np.float32)
+        self.masks = {category: self.categories == category for category in CATEGORIES}
+        # Fallback for a category the JD never mentions (e.g. no soft skills listed)
+        self.defaults = {
+            category: [skill["name"].lower() for skill in skills
+                       if skill["category"] == category and skill.get("default")]
+            for category in CATEGORIES
+        }
+
+    @classmethod
+    def load(cls, path=SKILL_VOCAB_PATH):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["skills"], version=data.get("version", 1))
+
+    def term_counts(self, text, trie):
+        """(V,) occurrences of every vocabulary skill in already-normalized text."""
+        counts = np.zeros(len(self.names), dtype=np.float32)
+        found = {name: n for name, n in trie.counts(text).items() if name in self.index}
+        if found:
+            counts[[self.index[name] for name in found]] = list(found.values())
+        return counts
+
+    def tfidf(self, text, trie):
+        """(V,) sublinear TF-IDF weight of every skill in text; 0 for skills it never mentions."""
+        counts = self.term_counts(text, trie)
+        weights = np.zeros_like(counts)
+        present = counts > 0
+        weights[present] = (1 + np.log(counts[present])) * self.idf[present]
+        return weights
+
+    def jd_keywords(self, jd_text, trie, role=None, extra=None):
+        """KeywordSet of the skills this JD asks for, ordered by weight.
+
+        `extra` adds {skill: (category, weight)} found outside this vocabulary
+        (a role pack's general skills the JD names verbatim).
+        """
+        weights = self.tfidf(jd_text, trie)
+        extra = extra or {}
+        categories, skill_weights = {}, {}
+        for category, mask in self.masks.items():
+            indices = np.flatnonzero(mask & (weights > 0))
+            found = [(self.names[i], float(weights[i])) for i in indices]
+            found += [(name, weight) for name, (cat, weight) in extra.items() if cat == category]
+            if found:
+                found.sort(key=lambda item: -item[1])
+                skills = [name for name, _ in found]
+                skill_weights.update(found)
+            else:
+                skills = list(self.defaults[category])
+                skill_weights.update((name, float(self.idf[self.index[name]])) for name in skills)
+            categories[category] = skills
+        return KeywordSet(categories, skill_weights, trie=trie, role=role)
+
+def compute_idf(documents, vocabulary, trie):
+    """Smoothed IDF of every vocabulary skill over a corpus of normalized JD texts.
+
+    Returns a (V,) array: log((1 + N) / (1 + df)) + 1, the same form
+    scikit-learn uses, so unseen skills get the highest weight.
+    """
+    presence = np.stack([vocabulary.term_counts(text, trie) > 0 for text in documents])
+    df = presence.sum(axis=0)
+    return (np.log((1 + len(documents)) / (1 + df)) + 1).astype(np.float32)
+
+
+def save_vocabulary(skills, path=SKILL_VOCAB_PATH, version=1, idf_source="prior"):
+    """Write the vocabulary JSON with one skill per line, so diffs stay readable."""
+    lines = ",\n".join("    " + json.dumps(skill, ensure_ascii=False) for skill in skills)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'{{\n  "version": {version},\n  "idf_source": {json.dumps(idf_source)},\n'
+                f'  "skills": [\n{lines}\n  ]\n}}\n')
+
+
+_vocabulary = None
+_vocabulary_lock = threading.Lock()
+
+
+def get_vocabulary():
+    """Process-wide SkillVocabulary, loaded on first use."""
+    global _vocabulary
+    if _vocabulary is None:
+        with _vocabulary_lock:
+            if _vocabulary is None:
+                _vocabulary = SkillVocabulary.load()
+    return _vocabulary
+
+
+# ----------------------------
+# Rebuild the IDF table from a JD corpus
+# ----------------------------
+if __name__ == "__main__":
+    import sys
+    from extract_text import ParsedDocument
+    from skill_taxonomy import get_skill_trie
+
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python skill_vocabulary.py <directory of job description .txt files>")
+    corpus_dir = sys.argv[1]
+    documents = []
+    for filename in sorted(os.listdir(corpus_dir)):
+        if filename.endswith(".txt"):
+            with open(os.path.join(corpus_dir, filename), encoding="utf-8", errors="replace") as f:
+                documents.append(ParsedDocument(f.read()).normalized)
+    if not documents:
+        sys.exit(f"No .txt files in {corpus_dir}")
+
+    vocabulary = SkillVocabulary.load()
+    idf = compute_idf(documents, vocabulary, get_skill_trie())
+    skills = [dict(skill, idf=round(float(value), 4)) for skill, value in zip(vocabulary.skills, idf)]
+    save_vocabulary(skills, version=vocabulary.version + 1, idf_source=f"corpus of {len(documents)} JDs")
+    print(f"✅ IDF recomputed from {len(documents)} job descriptions into {SKILL_VOCAB_PATH}")
@@ -25,6 +25,64 @@ function addMessage(sender, text) {
   msgDiv.innerHTML = `<strong>${sender}:</strong> ${text}`;
   chatMessages.appendChild(msgDiv);
   chatMessages.scrollTop = chatMessages.scrollHeight;
+  return msgDiv;
+}
+
+// ====== Stream a reply into one message (Server-Sent Events over fetch) ======
+function parseEvent(rawEvent) {
+  let name = "message";
+  let data = "";
+  for (const line of rawEvent.split("\n")) {
+    if (line.startsWith("event:")) name = line.slice(6).trim();
+    else if (line.startsWith("data:")) data += line.slice(5).trim();
+  }
+  return { name, payload: data ? JSON.parse(data) : {} };
+}
+
+async function streamReply(message) {
+  const response = await fetch("/chat/stream", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ message }),
+  });
+  // Throwing here (before anything is rendered) lets sendMessage fall back to /chat
+  if (!response.ok || !response.body) throw new Error("Streaming unavailable");
+
+  const msgDiv = addMessage("Bot", "");
+  const textSpan = document.createElement("span");
+  msgDiv.appendChild(textSpan);
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let reply = "";
+
+  try {
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += decoder.decode(value, { stream: true });
+
+      // Events are separated by a blank line
+      let boundary;
+      while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+        const { name, payload } = parseEvent(buffer.slice(0, boundary));
+        buffer = buffer.slice(boundary + 2);
+
+        if (name === "done") return;
+        if (name === "error") {
+          reply += (reply ? " " : "") + "⚠️ Error: " + payload.error;
+        } else if (payload.delta) {
+          reply = (reply + payload.delta).trimStart();
+        }
+        textSpan.textContent = reply;
+        chatMessages.scrollTop = chatMessages.scrollHeight;
+      }
+    }
+  } catch (error) {
+    // The reply has already started rendering, so report in place instead of falling back
+    textSpan.textContent = reply + (reply ? " " : "") + "⚠️ Error: connection lost.";
+  }
 }
 
 // ====== Send Message ======
@@ -36,16 +94,21 @@ async function sendMessage() {
   chatInput.value = "";
 
   try {
-    const response = await fetch("/chat", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ message }),
-    });
-
-    const data = await response.json();
-    addMessage("Bot", data.reply);
-  } catch (error) {
-    addMessage("Bot", "⚠️ Error: Unable to connect to the server.");
+    await streamReply(message);
+  } catch (streamError) {
+    // Fall back to the non-streaming endpoint
+    try {
+      const response = await fetch("/chat", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ message }),
+      });
+
+      const data = await response.json();
+      addMessage("Bot", data.reply);
+    } catch (error) {
+      addMessage("Bot", "⚠️ Error: Unable to connect to the server.");
+    }
   }
 }
 
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import py_compile
+import re
+import threading
+
+from jinja2 import BaseLoader, ModuleLoader, TemplateNotFound
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESUME_TEMPLATE_DIR = os.path.join(BASE_DIR, "templates", "resume_templates")
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+# Output of `flask build-templates`; used when present and matching the sources
+COMPILED_TEMPLATE_DIR = os.getenv("RESUME_TEMPLATES_COMPILED", os.path.join(BASE_DIR, "build", "resume_templates"))
+MANIFEST_NAME = "manifest.json"
+
+DEFAULT_TEMPLATE = "modern"
+
+
+class UnknownTemplate(ValueError):
+    """The requested resume template is not one of the registered templates."""
+
+
+# ----------------------------
+# Source preprocessing (CSS inlining + minification)
+# ----------------------------
+_STYLE_RE = re.compile(r"(<style[^>]*>)(.*?)(</style>)", re.S | re.I)
+_LINK_RE = re.compile(r"<link\b[^>]*\brel=[\"']?stylesheet[\"']?[^>]*>", re.I)
+_HREF_RE = re.compile(r"\bhref=[\"']([^\"']+)[\"']", re.I)
+
+
+def minify_css(css):
+    """Drop comments and the whitespace CSS does not need. Jinja tags inside are left alone."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+
+def _local_stylesheet(href):
+    """Filesystem path for a stylesheet served by this app, or None for remote URLs."""
+    if re.match(r"^(?:[a-z]+:)?//", href, re.I) or "{{" in href:
+        return None
+    path = href.split("?", 1)[0]
+    if path.startswith("/static/"):
+        path = os.path.join(STATIC_DIR, path[len("/static/"):])
+    else:
+        path = os.path.join(RESUME_TEMPLATE_DIR, path)
+    path = os.path.normpath(path)
+    return path if path.startswith(BASE_DIR) and os.path.isfile(path) else None
+
+
+def inline_stylesheets(html):
+    """Replace <link rel="stylesheet"> to local files with <style> blocks.
+
+    Remote stylesheets (e.g. Google Fonts) are kept as links: inlining them
+    would still leave the font files remote.
+    """
+    def replace(match):
+        href = _HREF_RE.search(match.group(0))
+        path = _local_stylesheet(href.group(1)) if href else None
+        if not path:
+            return match.group(0)
+        with open(path, encoding="utf-8") as f:
+            return f"<style>{f.read()}</style>"
+
+    return _LINK_RE.sub(replace, html)
+
+
+def preprocess(html):
+    html = inline_stylesheets(html)
+    return _STYLE_RE.sub(lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), html)
+
+
+def _digest(source):
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+class ResumeTemplateLoader(BaseLoader):
+    """Loads templates/resume_templates/<name>.html with CSS inlined and minified."""
+
+    def __init__(self, directory=RESUME_TEMPLATE_DIR):
+        self.directory = directory
+
+    def list_templates(self):
+        return sorted(f[:-len(".html")] for f in os.listdir(self.directory) if f.endswith(".html"))
+
+    def get_source(self, environment, template):
+        path = os.path.join(self.directory, f"{template}.html")
+        if template not in self.list_templates():
+            raise TemplateNotFound(template)
+        mtime = os.path.getmtime(path)
+        with open(path, encoding="utf-8") as f:
+            source = preprocess(f.read())
+        return source, path, lambda: os.path.getmtime(path) == mtime
+
+
+# ----------------------------
+# Preloaded registry
+# ----------------------------
+class TemplateRegistry:
+    """Every resume template compiled once at startup and looked up by name.
+
+    Names are checked against the registry, so user input never reaches the
+    filesystem. Templates come from the compiled modules written by build()
+    when their recorded source digest still matches, otherwise they are
+    compiled from source here.
+    """
+
+    def __init__(self, env, directory=RESUME_TEMPLATE_DIR, compiled_dir=COMPILED_TEMPLATE_DIR):
+        self.loader = ResumeTemplateLoader(directory)
+        # Registry names carry no .html suffix, so autoescaping is switched on explicitly
+        self.env = env.overlay(loader=self.loader, autoescape=True)
+        self.compiled_dir = compiled_dir
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """(Re)compile every template; returns the names loaded from prebuilt modules."""
+        manifest = self._read_manifest()
+        module_env = None
+        if manifest:
+            module_env = self.env.overlay(loader=ModuleLoader(self.compiled_dir))
+        entries, prebuilt = {}, []
+        for name in self.loader.list_templates():
+            source, _, _ = self.loader.get_source(self.env, name)
+            version = _digest(source)
+            if module_env is not None and manifest.get(name) == version:
+                template = module_env.get_template(name)
+                prebuilt.append(name)
+            else:
+                template = self.env.get_template(name)
+            entries[name] = (template, source, version)
+        with self._lock:
+            self._entries = entries
+        return prebuilt
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.compiled_dir, MANIFEST_NAME), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @property
+    def names(self):
+        return tuple(sorted(self._entries))
+
+    def resolve(self, name):
+        """Registered template name for user input; empty input means the default."""
+        name = name or DEFAULT_TEMPLATE
+        if name not in self._entries:
+            raise UnknownTemplate(f"Unknown template '{name}'. Choose one of: {', '.join(self.names)}")
+        return name
+
+    def get(self, name):
+        return self._entries[self.resolve(name)][0]
+
+    def source(self, name):
+        return self._entries[self.resolve(name)][1]
+
+    def version(self, name):
+        """Digest of the preprocessed source; changes whenever the template does."""
+        return self._entries[self.resolve(name)][2]
+
+    def render(self, template_name, context):
+        return self.get(template_name).render(context)
+
+    def build(self, target=None):
+        """Write every template as a compiled Python module (plus .pyc) and a digest manifest."""
+        target = target or self.compiled_dir
+        os.makedirs(target, exist_ok=True)
+        manifest = {}
+        for name in self.loader.list_templates():
+            source, filename, _ = self.loader.get_source(self.env, name)
+            code = self.env.compile(source, name, filename, raw=True, defer_init=True)
+            path = os.path.join(target, ModuleLoader.get_module_filename(name))
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(code)
+            py_compile.compile(path, doraise=True)
+            manifest[name] = _digest(source)
+        with open(os.path.join(target, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
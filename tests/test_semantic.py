@@ -0,0 +1,30 @@
+import pytest
+
+import semantic
+from semantic import HashingEmbedder, semantic_report
+from skill_taxonomy import get_skill_trie
+
+SKILLS = {"soft_skills": ["leadership", "teamwork", "communication"]}
+
+
+@pytest.fixture(autouse=True)
+def no_vector_store(monkeypatch):
+    monkeypatch.setattr(semantic, "jd_sentence_vectors", lambda sentences, embedder: embedder.encode(sentences))
+
+
+def matched(resume_text):
+    results = {category: {"matched": []} for category in SKILLS}
+    report = semantic_report(resume_text, "Leads a small team.", SKILLS, results, embedder=HashingEmbedder())
+    return set(report["soft_skills"]["matched"])
+
+
+def test_a_shared_word_is_not_evidence():
+    assert matched("Joined the team in 2020. Fixed printer jams.") == set()
+
+
+def test_paraphrase_is_evidence():
+    assert "leadership" in matched("Led a team of 5 engineers to ship the billing service.")
+
+
+def test_word_forms_share_stems():
+    assert semantic.content_stems("Leading teams") == semantic.content_stems("the team leader")
@@ -0,0 +1,69 @@
+import pytest
+
+from skill_taxonomy import get_skill_trie
+
+
+@pytest.fixture(scope="module")
+def trie():
+    return get_skill_trie()
+
+
+def found(trie, text):
+    return set(trie.find(text.lower()))
+
+
+@pytest.mark.parametrize("text, skill", [
+    ("Express your ideas clearly", "express.js"),
+    ("every node of the graph", "node.js"),
+    ("I went to the node. JS developers", "node.js"),
+    ("vue from the top", "vue.js"),
+    ("The AI team meets weekly", "artificial intelligence"),
+    ("Plan C is the fallback", "c"),
+    ("swift delivery of orders", "swift"),
+    ("raised in the rust belt", "rust"),
+    ("R&D budget", "r"),
+    ("C-suite exposure", "c"),
+    ("react quickly to customer needs", "react"),
+    ("rest, api gateways", "rest api"),
+    ("tap the sap from maple trees", "sap"),
+    ("restart the os? no, the process", "os"),
+    ("Ruby runs the front office", "ruby"),
+    ("a bash for the whole team", "bash"),
+    ("a ball of yarn", "yarn"),
+])
+def test_common_words_are_not_skills(trie, text, skill):
+    assert skill not in found(trie, text)
+
+
+@pytest.mark.parametrize("text, skill", [
+    ("Built services with Node.js and Express.js", "node.js"),
+    ("Built services with Node.js and Express.js", "express.js"),
+    ("nodejs, node-js or node js", "node.js"),
+    ("Experience with C/C++ and R.", "c"),
+    ("Experience with C/C++ and R.", "c++"),
+    ("Vue developer", "vue.js"),
+    ("AI engineer", "artificial intelligence"),
+    ("Statistics in R and Python", "r"),
+    ("SAP and Salesforce administration", "sap"),
+    ("Linux OS internals", "os"),
+    ("Ruby and Python scripting", "ruby"),
+    ("AI and machine learning", "artificial intelligence"),
+    ("iOS apps in Swift and Kotlin", "swift"),
+    ("Rust programming", "rust"),
+    ("Frontend: React, TypeScript", "react"),
+    ("k8s", "kubernetes"),
+    ("RESTful APIs", "rest api"),
+])
+def test_skills_are_found(trie, text, skill):
+    assert skill in found(trie, text)
+
+
+def test_context_does_not_cross_sentences(trie):
+    assert "swift" not in found(trie, "We value swift delivery. Python is a plus.")
+
+
+def test_offsets_point_at_the_match(trie):
+    text = "python and docker; later k8s"
+    positions = trie.find(text)
+    assert positions["python"] == [0]
+    assert text[positions["kubernetes"][0]:].startswith("k8s")